@@ -0,0 +1,39 @@
+# WorkZen HRMS - Flask application factory
+
+from flask import Flask
+import copy
+
+from .config import ROOT_PATH, settings
+from .database import db, apply_transaction_settings, stick_to_primary_after_write, transaction_settings
+from .monitoring import (count_statement_end, count_statement_start, log_slow_statements, record_request_metrics,
+                         start_request_metrics)
+from .commands import register_commands
+from .blueprints import admin, attendance, auth, calendar, employees, leave, main, payroll, profile, reports, team
+
+BLUEPRINTS = (main, auth, attendance, employees, team, leave, calendar, payroll, reports, profile, admin)
+
+def create_app(config=None):
+    """Build the WorkZen app: settings from the environment, overridden by config"""
+    app = Flask(__name__, root_path=ROOT_PATH)
+    app.config.from_mapping(copy.deepcopy(settings))
+    app.config.from_mapping(config or {})
+    app.secret_key = app.config['SECRET_KEY']
+    db.init_app(app)
+
+    with app.app_context():
+        for bind_key, engine in db.engines.items():
+            if transaction_settings(bind_key):
+                apply_transaction_settings(engine, transaction_settings(bind_key))
+            db.event.listen(engine, 'before_cursor_execute', count_statement_start)
+            db.event.listen(engine, 'after_cursor_execute', count_statement_end)
+            if app.config['SLOW_QUERY_MS']:
+                log_slow_statements(engine, bind_key or 'primary', app.config['SLOW_QUERY_MS'],
+                                    db.engines['reporting'])
+
+    app.before_request(start_request_metrics)
+    app.after_request(stick_to_primary_after_write)
+    app.after_request(record_request_metrics)
+    for module in BLUEPRINTS:
+        app.register_blueprint(module.bp)
+    register_commands(app)
+    return app
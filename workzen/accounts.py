@@ -0,0 +1,41 @@
+# WorkZen HRMS - login IDs, passwords and access decorators
+
+from flask import redirect, session, url_for
+from functools import wraps
+import secrets
+import string
+
+from .models import User
+
+def generate_login_id(first_name, last_name, year):
+    """Generate unique login ID"""
+    name_abbr = (first_name[:2] + last_name[:2]).upper()
+    year_str = str(year)
+    count = User.query.filter(User.login_id.ilike(f"{name_abbr}{year_str}%")).count()
+    serial = str(count + 1).zfill(4)
+    return f"{name_abbr}{year_str}{serial}"
+
+def generate_temp_password(length=12):
+    """Generate secure temporary password"""
+    return ''.join(secrets.choice(string.ascii_letters + string.digits + '!@#$') for _ in range(length))
+
+def login_required(f):
+    """Decorator to require login"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'user_id' not in session:
+            return redirect(url_for('auth.login'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+def role_required(*roles):
+    """Decorator for role-based access"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            user = User.query.get(session.get('user_id'))
+            if not user or user.role not in roles:
+                return redirect(url_for('auth.login')), 403
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
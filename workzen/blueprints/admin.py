@@ -0,0 +1,66 @@
+# WorkZen HRMS - admin routes
+
+from flask import Blueprint, abort, current_app, jsonify, make_response, render_template, request, session
+import secrets
+
+from ..database import InstrumentedQueuePool, db
+from ..models import User
+from ..accounts import login_required, role_required
+from ..monitoring import request_metrics, slow_query_log
+
+bp = Blueprint('admin', __name__)
+
+def metrics_authorized():
+    """Scrapers send METRICS_TOKEN as a bearer token; a signed-in admin may also look"""
+    token = current_app.config['METRICS_TOKEN']
+    if token and secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    user = User.query.get(session['user_id']) if 'user_id' in session else None
+    return user is not None and user.role == 'ADMIN'
+
+@bp.route('/metrics')
+def metrics():
+    """Prometheus metrics for this process: request and SQL histograms, pool usage"""
+    if not metrics_authorized():
+        abort(401)
+    lines = request_metrics.render()
+    pools = {
+        (key or 'primary'): engine.pool for key, engine in db.engines.items()
+        if isinstance(engine.pool, InstrumentedQueuePool)
+    }
+    for name, kind, help_text, value in [
+        ('workzen_db_pool_size', 'gauge', 'Connections kept open', lambda pool: pool.size()),
+        ('workzen_db_pool_checked_out', 'gauge', 'Connections in use', lambda pool: pool.checkedout()),
+        ('workzen_db_pool_overflow', 'gauge', 'Connections open beyond pool_size', lambda pool: max(pool.overflow(), 0)),
+        ('workzen_db_pool_checkouts_total', 'counter', 'Connection checkouts', lambda pool: pool.metrics.waits),
+        ('workzen_db_pool_wait_seconds_total', 'counter', 'Time spent waiting for a connection',
+         lambda pool: pool.metrics.wait_seconds),
+        ('workzen_db_pool_timeouts_total', 'counter', 'Checkouts that timed out', lambda pool: pool.metrics.timeouts),
+    ]:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+        lines += [f'{name}{{bind="{bind}"}} {value(pool)}' for bind, pool in pools.items()]
+    response = make_response('\n'.join(lines) + '\n')
+    response.mimetype = 'text/plain'
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return response
+
+@bp.route('/admin/db/pool')
+@login_required
+@role_required('ADMIN')
+def database_pool_status():
+    """Live connection pool usage and checkout wait times, per database"""
+    return jsonify({
+        (key or 'primary'): engine.pool.metrics.snapshot(engine.pool)
+        for key, engine in db.engines.items()
+        if isinstance(engine.pool, InstrumentedQueuePool)
+    }), 200
+
+@bp.route('/admin/diagnostics/slow-queries')
+@login_required
+@role_required('ADMIN')
+def slow_queries_page():
+    """Recent slow statements with their sampled EXPLAIN plans"""
+    user = User.query.get(session.get('user_id'))
+    return render_template('slow_queries.html', user=user, entries=slow_query_log.recent(),
+                           threshold_ms=current_app.config['SLOW_QUERY_MS'],
+                           explain_sample=current_app.config['SLOW_QUERY_EXPLAIN_SAMPLE'])
@@ -0,0 +1,66 @@
+# WorkZen HRMS - attendance routes
+
+from flask import Blueprint, jsonify, render_template, session
+from datetime import datetime
+
+from ..database import db, replica_reads
+from ..models import Attendance, User
+from ..accounts import login_required
+
+bp = Blueprint('attendance', __name__)
+
+@bp.route('/attendance')
+@replica_reads
+@login_required
+def attendance_page():
+    user = User.query.get(session.get('user_id'))
+    # Fetch data from database, e.g., attendance records for user or all users
+    # Example: attendance_records = Attendance.query.filter_by(user_id=user.id).all()
+
+    attendance_records = Attendance.query.order_by(Attendance.attendance_date.desc()).limit(20).all()
+    
+    return render_template('attendance.html', user=user, attendance_records=attendance_records)
+
+@bp.route('/mark_attendance')
+@login_required
+def mark_attendance():
+    # Render a template or redirect as needed for marking attendance
+    return render_template('mark_attendance.html')
+
+@bp.route('/api/attendance/checkin', methods=['POST'])
+@login_required
+def checkin():
+    """Mark check-in (Employee)"""
+    user_id = session.get('user_id')
+    today = datetime.now().date()
+    existing = Attendance.query.filter_by(user_id=user_id, attendance_date=today).first()
+    if existing:
+        return jsonify({'error': 'Already checked in today'}), 400
+
+    attendance = Attendance(
+        user_id=user_id,
+        attendance_date=today,
+        check_in=datetime.now().time(),
+        status='Present'
+    )
+    db.session.add(attendance)
+    db.session.commit()
+    return jsonify({'message': 'Checked in successfully'}), 200
+
+@bp.route('/api/attendance/checkout', methods=['POST'])
+@login_required
+def checkout():
+    """Mark check-out (Employee)"""
+    user_id = session.get('user_id')
+    today = datetime.now().date()
+    attendance = Attendance.query.filter_by(user_id=user_id, attendance_date=today).first()
+    if not attendance:
+        return jsonify({'error': 'No check-in record found'}), 404
+
+    attendance.check_out = datetime.now().time()
+    if attendance.check_in and attendance.check_out:
+        check_in_dt = datetime.combine(today, attendance.check_in)
+        check_out_dt = datetime.combine(today, attendance.check_out)
+        attendance.working_hours = (check_out_dt - check_in_dt).total_seconds() / 3600
+    db.session.commit()
+    return jsonify({'message': 'Checked out successfully'}), 200
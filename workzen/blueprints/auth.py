@@ -0,0 +1,91 @@
+# WorkZen HRMS - auth routes
+
+from flask import Blueprint, redirect, render_template, request, session, url_for
+from datetime import datetime
+
+from ..database import db
+from ..models import Role, User, enum_arg
+from ..accounts import generate_login_id, generate_temp_password
+from ..caches import approver_pool, departments
+from ..hierarchy import link_user_hierarchy
+
+bp = Blueprint('auth', __name__)
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    """User login"""
+    if request.method == 'POST':
+        login_id = request.form.get('login_id')
+        password = request.form.get('password')
+
+        user = User.query.filter_by(login_id=login_id, is_active=True).first()
+        if user and user.check_password(password):
+            session['user_id'] = user.id
+            session['role'] = user.role
+            session['full_name'] = user.full_name
+            return redirect(url_for('main.dashboard'))
+
+        return render_template('login.html', error='Invalid credentials'), 401
+
+    return render_template('login.html')
+
+@bp.route('/signup', methods=['GET', 'POST'])
+def signup():
+    """User signup (new Employees)"""
+    if request.method == 'POST':
+        first_name = request.form.get('first_name', '').strip()
+        last_name = request.form.get('last_name', '').strip()
+        if not first_name or not last_name:
+            return render_template('signup.html', error='First name and last name are required'), 400
+
+        full_name = f"{first_name} {last_name}"
+        email = request.form.get('email')
+        phone = request.form.get('phone')
+        department = request.form.get('department')
+        # By default new signups are 'EMPLOYEE' role
+        role = enum_arg(Role, request.form.get('role', 'EMPLOYEE'))  # Get from form
+        if role is None:
+            return render_template('signup.html', error='Unknown role'), 400
+
+        if User.query.filter_by(email=email).first():
+            return render_template('signup.html', error='Email already exists'), 400
+
+        login_id = generate_login_id(first_name, last_name, datetime.now().year)
+        temp_password = generate_temp_password()
+
+        user = User(
+            login_id=login_id,
+            email=email,
+            full_name=full_name,
+            phone=phone,
+            department_id=departments.resolve(department),
+            department=(department or '').strip() or None,
+            role=role,
+            date_of_joining=datetime.now().date()
+        )
+        user.set_password(temp_password)
+        db.session.add(user)
+        db.session.flush()
+        link_user_hierarchy(user.id, user.manager_id)
+        db.session.commit()
+        if user.role == 'HR_OFFICER':
+            approver_pool.invalidate()
+
+        # Auto-login after signup
+        session['user_id'] = user.id
+        session['role'] = user.role
+        session['full_name'] = user.full_name
+        return redirect(url_for('main.dashboard'))
+
+    return render_template('signup.html')
+
+@bp.route('/register')
+def register():
+    """Redirect to signup page"""
+    return redirect(url_for('auth.signup'))
+
+@bp.route('/logout')
+def logout():
+    """User logout"""
+    session.clear()
+    return redirect(url_for('auth.login'))
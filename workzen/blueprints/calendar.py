@@ -0,0 +1,201 @@
+# WorkZen HRMS - calendar routes
+
+from flask import Blueprint, jsonify, request, session
+from datetime import date, datetime, timedelta
+
+from ..database import db
+from ..models import Attendance, Holiday, Leave, User
+from ..accounts import login_required, role_required
+from ..caches import availability_cache, company_calendar, department_id_arg
+
+bp = Blueprint('calendar', __name__)
+
+# Longest range working days can be counted for
+MAX_WORKING_DAYS_RANGE = 366
+
+@bp.route('/api/calendar/working-days')
+@login_required
+def calendar_working_days():
+    """Count working days in a date range using the company calendar"""
+    try:
+        start_date = datetime.strptime(request.args.get('start_date'), '%Y-%m-%d').date()
+        end_date = datetime.strptime(request.args.get('end_date'), '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return jsonify(error='start_date and end_date are required (YYYY-MM-DD)'), 400
+    if end_date < start_date:
+        return jsonify(error='End date cannot be before start date'), 400
+    if (end_date - start_date).days + 1 > MAX_WORKING_DAYS_RANGE:
+        return jsonify(error=f'Date range is limited to {MAX_WORKING_DAYS_RANGE} days'), 400
+
+    return jsonify(working_days=company_calendar.working_days(start_date, end_date)), 200
+
+# Longest range the availability matrix can be requested for
+MAX_AVAILABILITY_DAYS = 92
+
+@bp.route('/api/calendar/availability')
+@login_required
+def calendar_availability():
+    """Who is out on each day of a range, for a department or a manager's team
+
+    Query params: start_date, end_date (YYYY-MM-DD) and either department (id)
+    or manager_id (direct reports). Without a scope, managers see their team,
+    everyone else their department, and someone with neither only themselves. Each employee gets one character per day:
+    '.' in office, 'L' approved leave, 'P' pending leave, 'A' absent,
+    '-' non-working day.
+    """
+    try:
+        start_date = datetime.strptime(request.args.get('start_date'), '%Y-%m-%d').date()
+        end_date = datetime.strptime(request.args.get('end_date'), '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return jsonify(error='start_date and end_date are required (YYYY-MM-DD)'), 400
+    if end_date < start_date:
+        return jsonify(error='End date cannot be before start date'), 400
+    num_days = (end_date - start_date).days + 1
+    if num_days > MAX_AVAILABILITY_DAYS:
+        return jsonify(error=f'Date range is limited to {MAX_AVAILABILITY_DAYS} days'), 400
+
+    user = User.query.get(session.get('user_id'))
+    is_hr = user.role in ['HR_OFFICER', 'ADMIN']
+    department_id = department_id_arg(request.args.get('department'))
+    manager_id = request.args.get('manager_id', type=int)
+    if manager_id is None and department_id is None:
+        if db.session.query(User.query.filter_by(manager_id=user.id, is_active=True).exists()).scalar():
+            manager_id = user.id
+        else:
+            department_id = user.department_id
+    if not is_hr and (manager_id not in (None, user.id) or
+                      (manager_id is None and department_id != user.department_id)):
+        return jsonify(error='Unauthorized'), 403
+
+    if manager_id is not None:
+        scope, key = User.manager_id == manager_id, ('manager', manager_id)
+    elif department_id is not None:
+        scope, key = User.department_id == department_id, ('department', department_id)
+    else:
+        # No department and no reports: only the caller, never everyone without a department
+        scope, key = User.id == user.id, ('user', user.id)
+    key += (start_date, end_date)
+
+    # Closed past ranges cannot change except through invalidate()
+    closed = end_date < datetime.now().date()
+    if closed:
+        cached = availability_cache.get(key)
+        if cached is not None:
+            return jsonify(cached), 200
+
+    team = db.select(User.id).where(scope, User.is_active.is_(True))
+    employees = db.session.execute(
+        db.select(User.id, User.full_name).where(User.id.in_(team)).order_by(User.full_name)
+    ).all()
+
+    days = [start_date + timedelta(days=offset) for offset in range(num_days)]
+    non_working = [offset for offset, day in enumerate(days) if not company_calendar.working_days(day, day)]
+    rows = {}
+    for employee in employees:
+        row = ['.'] * num_days
+        for offset in non_working:
+            row[offset] = '-'
+        rows[employee.id] = row
+
+    def mark(user_id, first, last, code):
+        row = rows.get(user_id)
+        if row is None:
+            return
+        for offset in range(max((first - start_date).days, 0), min((last - start_date).days, num_days - 1) + 1):
+            if row[offset] != '-':
+                row[offset] = code
+
+    # Attendance first so leave codes take precedence on the same day
+    absences = db.session.execute(
+        db.select(Attendance.user_id, Attendance.attendance_date).where(
+            Attendance.user_id.in_(team),
+            Attendance.attendance_date.between(start_date, end_date),
+            Attendance.status == 'Absent'
+        )
+    )
+    for absence in absences:
+        mark(absence.user_id, absence.attendance_date, absence.attendance_date, 'A')
+
+    # Served by the (user_id, daterange) GiST index behind the overlap constraint
+    leaves = db.session.execute(
+        db.select(Leave.user_id, Leave.start_date, Leave.end_date, Leave.status).where(
+            Leave.user_id.in_(team),
+            Leave.overlapping(start_date, end_date)
+        )
+    )
+    for leave in leaves:
+        mark(leave.user_id, leave.start_date, leave.end_date, 'L' if leave.status == 'Approved' else 'P')
+
+    result = {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'scope': {key[0]: key[1]},
+        'employees': [
+            {'id': employee.id, 'name': employee.full_name, 'days': ''.join(rows[employee.id])}
+            for employee in employees
+        ],
+        'out_per_day': [
+            sum(1 for row in rows.values() if row[offset] in 'LA') for offset in range(num_days)
+        ]
+    }
+    if closed:
+        availability_cache.put(key, result)
+    return jsonify(result), 200
+
+@bp.route('/api/holidays')
+@login_required
+def list_holidays():
+    """List company holidays for a year"""
+    year = request.args.get('year', datetime.now().year, type=int)
+    holidays = Holiday.query.filter(
+        Holiday.holiday_date >= date(year, 1, 1),
+        Holiday.holiday_date <= date(year, 12, 31)
+    ).order_by(Holiday.holiday_date).all()
+
+    return jsonify(holidays=[
+        {'id': h.id, 'date': h.holiday_date.isoformat(), 'name': h.name}
+        for h in holidays
+    ]), 200
+
+@bp.route('/api/holidays', methods=['POST'])
+@login_required
+@role_required('ADMIN', 'HR_OFFICER')
+def add_holiday():
+    """Add a company holiday (Admin or HR Officer)"""
+    try:
+        data = request.get_json()
+        holiday_date = datetime.strptime(data.get('date'), '%Y-%m-%d').date()
+        name = (data.get('name') or '').strip()
+        if not name:
+            return jsonify(error='Holiday name is required'), 400
+
+        if Holiday.query.filter_by(holiday_date=holiday_date).first():
+            return jsonify(error='A holiday already exists on this date'), 400
+
+        holiday = Holiday(holiday_date=holiday_date, name=name)
+        db.session.add(holiday)
+        db.session.commit()
+        company_calendar.invalidate(holiday_date.year)
+        availability_cache.invalidate()
+
+        return jsonify(message='Holiday added successfully', holiday_id=holiday.id), 201
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(error=str(e)), 500
+
+@bp.route('/api/holidays/<int:holiday_id>', methods=['DELETE'])
+@login_required
+@role_required('ADMIN', 'HR_OFFICER')
+def delete_holiday(holiday_id):
+    """Remove a company holiday (Admin or HR Officer)"""
+    holiday = Holiday.query.get(holiday_id)
+    if not holiday:
+        return jsonify({'error': 'Holiday not found'}), 404
+
+    year = holiday.holiday_date.year
+    db.session.delete(holiday)
+    db.session.commit()
+    company_calendar.invalidate(year)
+    availability_cache.invalidate()
+    return jsonify({'message': 'Holiday removed successfully'}), 200
@@ -0,0 +1,233 @@
+# WorkZen HRMS - employees routes
+
+from flask import Blueprint, current_app, jsonify, render_template, request
+from datetime import datetime
+
+from ..database import db, replica_reads
+from ..models import LeaveBalance, Role, User, enum_arg, enum_filter
+from ..accounts import generate_login_id, generate_temp_password, login_required, role_required
+from ..caches import approver_pool, department_id_arg, departments, leave_policies
+from ..hierarchy import link_user_hierarchy
+from ..search import employee_search_clause, employee_search_rank
+
+bp = Blueprint('employees', __name__)
+
+@bp.route('/employees')
+@replica_reads
+@login_required
+@role_required('ADMIN', 'HR_OFFICER', 'PAYROLL_OFFICER', 'EMPLOYEE')
+def employees_page():
+    """Employee directory (view-only for Employees)"""
+    search = request.args.get('q', '').strip()
+    department_id = department_id_arg(request.args.get('department'))
+    role = request.args.get('role', '')
+    page = request.args.get('page', 1, type=int)
+
+    query = db.select(User)
+    if search:
+        query = query.where(employee_search_clause(search))
+    if department_id is not None:
+        query = query.where(User.department_id == department_id)
+    if role:
+        query = query.where(enum_filter(User.role, Role, role))
+    order = (employee_search_rank(search), User.full_name) if search else (User.full_name,)
+    users = db.paginate(query.order_by(*order), page=page,
+                        per_page=current_app.config['EMPLOYEES_PER_PAGE'], error_out=False)
+
+    stats = db.session.execute(db.select(
+        db.func.count(User.id),
+        db.func.count(User.id).filter(User.is_active.is_(True)),
+        db.func.count(db.distinct(User.department_id))
+    )).one()
+
+    return render_template('employees.html',
+                         users=users,
+                         total_employees=stats[0],
+                         active_employees=stats[1],
+                         department_count=stats[2],
+                         departments=departments.all(),
+                         search=search,
+                         department_filter=department_id,
+                         role_filter=role)
+
+# Upper bound on autocomplete suggestions per request
+MAX_EMPLOYEE_SEARCH_RESULTS = 50
+
+@bp.route('/api/employees/search')
+@login_required
+def search_employees():
+    """Ranked employee autocomplete over name, login ID, email, department and job title"""
+    search = request.args.get('q', '').strip()
+    limit = max(1, min(request.args.get('limit', 10, type=int), MAX_EMPLOYEE_SEARCH_RESULTS))
+    if not search:
+        return jsonify(results=[]), 200
+
+    rows = db.session.execute(
+        db.select(
+            User.id, User.full_name, User.login_id, User.email,
+            User.department, User.job_title, User.is_active
+        ).where(employee_search_clause(search)).order_by(
+            employee_search_rank(search), User.full_name
+        ).limit(limit)
+    )
+    return jsonify(results=[
+        {
+            'id': row.id,
+            'name': row.full_name,
+            'login_id': row.login_id,
+            'email': row.email,
+            'department': row.department,
+            'job_title': row.job_title,
+            'is_active': row.is_active
+        }
+        for row in rows
+    ]), 200
+
+@bp.route('/employees/add')
+@login_required
+@role_required('ADMIN', 'HR_OFFICER')
+def add_employee():
+    """Add new employee page (Admin or HR Officer only)"""
+    return render_template('add_employee.html', departments=departments.all())
+
+@bp.route('/api/employees/add', methods=['POST'])
+@login_required
+@role_required('ADMIN', 'HR_OFFICER')
+def create_employee():
+    """Create new employee (Admin or HR Officer only)"""
+    try:
+        data = request.get_json()
+        
+        # Check if email already exists
+        if User.query.filter_by(email=data.get('email')).first():
+            return jsonify({'error': 'Email already exists'}), 400
+        
+        # Generate login ID
+        first_name = data.get('first_name', '').strip()
+        last_name = data.get('last_name', '').strip()
+        
+        if not first_name or not last_name:
+            return jsonify({'error': 'First name and last name are required'}), 400
+        
+        full_name = f"{first_name} {last_name}"
+
+        role = enum_arg(Role, data.get('role', 'EMPLOYEE'))
+        if role is None:
+            return jsonify({'error': 'Unknown role'}), 400
+
+        # Department by id (form) or by name (API); unknown names are created
+        if data.get('department_id'):
+            department_id = int(data['department_id'])
+            department = departments.name(department_id)
+            if department is None:
+                return jsonify({'error': 'Unknown department'}), 400
+        else:
+            department = (data.get('department') or '').strip() or None
+            department_id = departments.resolve(department)
+
+        login_id = generate_login_id(first_name, last_name, datetime.now().year)
+        temp_password = generate_temp_password()
+        
+        # Parse date fields
+        date_of_birth = None
+        if data.get('date_of_birth'):
+            date_of_birth = datetime.strptime(data.get('date_of_birth'), '%Y-%m-%d').date()
+        
+        date_of_joining = datetime.now().date()
+        if data.get('date_of_joining'):
+            date_of_joining = datetime.strptime(data.get('date_of_joining'), '%Y-%m-%d').date()
+        
+        # Create new user
+        user = User(
+            login_id=login_id,
+            email=data.get('email'),
+            full_name=full_name,
+            phone=data.get('phone'),
+            role=role,
+            department=department,
+            department_id=department_id,
+            job_position=data.get('job_position'),
+            job_title=data.get('job_title'),
+            manager_id=data.get('manager_id') or None,
+            employment_type=data.get('employment_type'),
+            contract_type=data.get('contract_type'),
+            date_of_joining=date_of_joining,
+            date_of_birth=date_of_birth,
+            gender=data.get('gender'),
+            nationality=data.get('nationality'),
+            work_location=data.get('work_location'),
+            work_address=data.get('work_address'),
+            time_zone=data.get('time_zone'),
+            shift_time=data.get('shift_time'),
+            working_hours=data.get('working_hours'),
+            wage_type=data.get('wage_type'),
+            wage=float(data.get('wage')) if data.get('wage') else None,
+            basic_salary=float(data.get('basic_salary')) if data.get('basic_salary') else None,
+            emergency_contact_name=data.get('emergency_contact_name'),
+            emergency_contact_relation=data.get('emergency_contact_relation'),
+            emergency_contact_phone=data.get('emergency_contact_phone'),
+            is_active=True
+        )
+        
+        user.set_password(temp_password)
+        db.session.add(user)
+        db.session.flush()
+        link_user_hierarchy(user.id, user.manager_id)
+        db.session.commit()
+        if user.role == 'HR_OFFICER' or user.manager_id:
+            approver_pool.invalidate()
+
+        # Create leave balances for every policy the employee is eligible for
+        current_year = datetime.now().year
+        for policy in leave_policies.eligible_policies(user.employment_type, user.contract_type):
+            balance = LeaveBalance(
+                user_id=user.id,
+                leave_type=policy.leave_type,
+                total_days=policy.opening_days,
+                used_days=0,
+                remaining_days=policy.opening_days,
+                year=current_year
+            )
+            db.session.add(balance)
+        
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Employee added successfully',
+            'employee_id': user.id,
+            'login_id': login_id,
+            'temp_password': temp_password
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/departments')
+@login_required
+def list_departments():
+    """List departments"""
+    return jsonify(departments=[{'id': d.id, 'name': d.name} for d in departments.all()]), 200
+
+@bp.route('/api/departments', methods=['POST'])
+@login_required
+@role_required('ADMIN', 'HR_OFFICER')
+def create_department():
+    """Add a department (Admin or HR Officer)"""
+    try:
+        name = ((request.get_json() or {}).get('name') or '').strip()
+        if not name:
+            return jsonify({'error': 'Department name is required'}), 400
+        if departments.id_for(name) is not None:
+            return jsonify({'error': 'Department already exists'}), 400
+
+        department_id = departments.resolve(name)
+        db.session.commit()
+        departments.invalidate()
+
+        return jsonify({'message': 'Department created successfully', 'department_id': department_id}), 201
+
+    except Exception as e:
+        db.session.rollback()
+        departments.invalidate()
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,558 @@
+# WorkZen HRMS - leave routes
+
+from flask import Blueprint, current_app, jsonify, render_template, request, session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+
+from ..database import db, replica_reads
+from ..models import Leave, LeaveBalance, LeavePolicy, LeaveStatus, User, enum_filter
+from ..accounts import login_required, role_required
+from ..caches import approver_pool, availability_cache, company_calendar, leave_policies
+from ..services import BALANCE_INSERT_COLUMNS, accrue_leave, initialize_leave_balances, rollover_leave_balances
+
+bp = Blueprint('leave', __name__)
+
+@bp.route('/admin/initialize-all-leave-balances', methods=['POST'])
+@login_required
+@role_required('ADMIN', 'PAYROLL_OFFICER')
+def initialize_all_leave_balances():
+    """Initialize leave balances for all active employees"""
+    try:
+        current_year = datetime.now().year
+        employee_count = User.query.filter_by(role='EMPLOYEE', is_active=True).count()
+        created_count = initialize_leave_balances(current_year)
+        db.session.commit()
+        
+        return jsonify(
+            message=f'Successfully initialized leave balances for {employee_count} employees',
+            created_records=created_count,
+            status='success'
+        ), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(error=str(e), status='error'), 500
+
+@bp.route('/admin/leave-balances/rollover', methods=['POST'])
+@login_required
+@role_required('ADMIN', 'PAYROLL_OFFICER')
+def rollover_all_leave_balances():
+    """Open next year's leave balances with carry-forward"""
+    try:
+        data = request.get_json(silent=True) or {}
+        year = int(data.get('year') or datetime.now().year + 1)
+        written = rollover_leave_balances(year)
+        db.session.commit()
+
+        return jsonify(
+            message=f'Leave balances rolled over into {year}',
+            written_records=written,
+            status='success'
+        ), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(error=str(e), status='error'), 500
+
+@bp.route('/admin/leave-balances/accrue', methods=['POST'])
+@login_required
+@role_required('ADMIN', 'PAYROLL_OFFICER')
+def accrue_all_leave_balances():
+    """Credit a month of leave accrual (defaults to the current month)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        month = data.get('month')
+        period = datetime.strptime(month, '%Y-%m').date() if month else datetime.now().date()
+        credited = accrue_leave(period)
+        db.session.commit()
+
+        return jsonify(
+            message=f'Leave accrued for {period:%Y-%m}',
+            credited_records=credited,
+            status='success'
+        ), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(error=str(e), status='error'), 500
+
+@bp.route('/timeoff')
+@replica_reads
+@login_required
+def timeoff():
+    """Time off / Leave management page"""
+    user_id = session.get('user_id')
+    user = User.query.get(user_id)
+    current_year = datetime.now().year
+    today = datetime.now().date()
+    is_hr = user.role in ['HR_OFFICER', 'ADMIN']
+
+    # Filters for the "All Leave Requests" tab
+    status_filter = request.args.get('status', '')
+    search = request.args.get('q', '').strip()
+    active_tab = request.args.get('tab', 'myLeaves')
+    per_page = current_app.config['LEAVES_PER_PAGE']
+
+    # Get user's own leaves
+    leaves = Leave.query.options(db.joinedload(Leave.approver)).filter_by(
+        user_id=user_id
+    ).order_by(Leave.created_at.desc()).all()
+    
+    # Get user's leave balance
+    leave_balance = LeaveBalance.query.filter_by(user_id=user_id, year=current_year).all()
+
+    # All leave requests (everyone can see), filtered and paginated in the database
+    all_query = db.select(Leave).join(Leave.requester).options(
+        db.contains_eager(Leave.requester),
+        db.joinedload(Leave.approver)
+    )
+    if status_filter:
+        all_query = all_query.where(enum_filter(Leave.status, LeaveStatus, status_filter))
+    if search:
+        all_query = all_query.where(db.or_(
+            User.full_name.ilike(f'%{search}%'),
+            User.login_id.ilike(f'%{search}%')
+        ))
+    all_leaves = db.paginate(
+        all_query.order_by(Leave.created_at.desc()),
+        page=request.args.get('page', 1, type=int),
+        per_page=per_page,
+        error_out=False
+    )
+
+    # Pending approvals: everything for HR/Admin, otherwise requests routed to this user
+    pending_query = db.select(Leave).where(Leave.status == 'Pending').options(
+        db.joinedload(Leave.requester)
+    )
+    counts_query = db.session.query(Leave.status, db.func.count(Leave.id)).filter(
+        db.or_(Leave.status == 'Pending', Leave.updated_at >= today)
+    )
+    if not is_hr:
+        pending_query = pending_query.where(Leave.approved_by == user_id)
+        counts_query = counts_query.filter(Leave.approved_by == user_id)
+
+    pending_leaves = db.paginate(
+        pending_query.order_by(Leave.created_at.desc()),
+        page=request.args.get('pending_page', 1, type=int),
+        per_page=per_page,
+        error_out=False
+    )
+
+    # Pending, approved-today and rejected-today counts in one query
+    status_counts = dict(counts_query.group_by(Leave.status).all())
+    pending_count = status_counts.get('Pending', 0)
+    approved_today = status_counts.get('Approved', 0)
+    rejected_today = status_counts.get('Rejected', 0)
+
+    return render_template('timeoff.html',
+                         user=user,
+                         leave_types=list(leave_policies.policies()),
+                         leaves=leaves,
+                         leave_balance=leave_balance,
+                         current_year=current_year,
+                         all_leaves=all_leaves,
+                         pending_leaves=pending_leaves,
+                         pending_count=pending_count,
+                         approved_today=approved_today,
+                         rejected_today=rejected_today,
+                         status_filter=status_filter,
+                         search=search,
+                         active_tab=active_tab)
+
+@bp.route('/api/leaves/apply', methods=['POST'])
+@login_required
+def apply_leave():
+    """Apply for leave (Employee)"""
+    try:
+        user_id = session.get('user_id')
+        data = request.get_json()
+
+        start_date = datetime.strptime(data.get('start_date'), '%Y-%m-%d').date()
+        end_date = datetime.strptime(data.get('end_date'), '%Y-%m-%d').date()
+        leave_type = data.get('leave_type')
+        reason = data.get('reason')
+
+        if end_date < start_date:
+            return jsonify(error='End date cannot be before start date'), 400
+
+        # Only working days (company calendar) count against the balance
+        num_days = company_calendar.working_days(start_date, end_date)
+        if num_days == 0:
+            return jsonify(error='Selected dates contain no working days'), 400
+        # Charged against the balance of the year the leave starts in
+        balance_year = start_date.year
+
+        policy = leave_policies.get(leave_type)
+        if policy is None:
+            return jsonify(error=f'Unknown leave type: {leave_type}'), 400
+
+        # 1) Make sure the balance row exists if the employee is eligible (no separate commit)
+        db.session.execute(
+            pg_insert(LeaveBalance).from_select(
+                BALANCE_INSERT_COLUMNS,
+                db.select(
+                    User.id, db.literal(leave_type), db.literal(policy.opening_days), db.literal(0),
+                    db.literal(policy.opening_days), db.literal(0), db.literal(balance_year), db.func.now()
+                ).where(User.id == user_id, leave_policies.user_clause(policy))
+            ).on_conflict_do_nothing(index_elements=['user_id', 'leave_type', 'year'])
+        )
+
+        # 2) Reserve the days atomically; the row lock makes parallel requests queue up
+        reserved = db.session.execute(
+            db.update(LeaveBalance).where(
+                LeaveBalance.user_id == user_id,
+                LeaveBalance.leave_type == leave_type,
+                LeaveBalance.year == balance_year,
+                LeaveBalance.remaining_days >= num_days
+            ).values(
+                remaining_days=LeaveBalance.remaining_days - num_days
+            ).returning(LeaveBalance.remaining_days),
+            execution_options={'synchronize_session': False}
+        ).first()
+
+        if reserved is None:
+            # Read before rolling back, which would also undo a balance opened in step 1
+            available = db.session.query(LeaveBalance.remaining_days).filter_by(
+                user_id=user_id,
+                leave_type=leave_type,
+                year=balance_year
+            ).scalar()
+            db.session.rollback()
+            if available is None:
+                return jsonify(error=f'You are not eligible for {leave_type} leave'), 400
+            return jsonify(
+                error=f'Insufficient leave balance. Available: {available} days, Requested: {num_days} days'
+            ), 400
+
+        # 3) Create leave request assigned to the routed approver (no lookup query)
+        approver_id, approver_name = approver_pool.route(user_id)
+        leave_id = db.session.execute(
+            db.insert(Leave).values(
+                user_id=user_id,
+                leave_type=leave_type,
+                start_date=start_date,
+                end_date=end_date,
+                reason=reason,
+                number_of_days=num_days,
+                status='Pending',
+                approved_by=approver_id
+            ).returning(Leave.id)
+        ).scalar()
+
+        db.session.commit()
+        approver_pool.assigned(approver_id)
+        availability_cache.invalidate()
+
+        return jsonify(
+            message='Leave request submitted successfully and sent for approval',
+            leave_id=leave_id,
+            assigned_to=approver_name or 'No approver assigned'
+        ), 201
+
+    except IntegrityError as e:
+        db.session.rollback()
+        if getattr(e.orig, 'pgcode', None) == '23P01':  # exclusion_violation: overlaps a pending or approved leave
+            # Only looked up on a conflict, so the normal path stays at three statements
+            conflict = db.session.execute(
+                db.select(Leave.id, Leave.start_date, Leave.end_date, Leave.status).where(
+                    Leave.user_id == user_id,
+                    Leave.overlapping(start_date, end_date)
+                ).limit(1)
+            ).first()
+            if conflict is None:
+                return jsonify(error='Leave request overlaps another pending or approved leave'), 409
+            return jsonify(
+                error=f'Overlaps your {conflict.status.lower()} leave from {conflict.start_date} to {conflict.end_date}',
+                conflicting_leave_id=conflict.id
+            ), 409
+        return jsonify(error=str(e)), 500
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(error=str(e)), 500
+
+# Upper bound on leave requests decided in one batch call
+MAX_LEAVE_BATCH = 500
+
+def can_decide_leave(user, leave):
+    """Admins, HR Officers and the assigned approver may approve or reject a leave"""
+    return user.role in ['ADMIN', 'HR_OFFICER'] or leave.approved_by == user.id
+
+# Allowed leave status transitions and their balance deltas, as multipliers of
+# number_of_days: (used_days, remaining_days). Days are reserved from
+# remaining_days when the leave is applied for.
+LEAVE_TRANSITIONS = {
+    ('Pending', 'Approved'): (1, 0),
+    ('Pending', 'Rejected'): (0, 1),
+    ('Approved', 'Rejected'): (-1, 1),
+}
+
+def transition_leaves(leave_ids, from_status, to_status, actor_id, version=None):
+    """Move leaves from from_status to to_status and apply their balance deltas.
+
+    Runs as a single statement: the leaves UPDATE only matches rows still in
+    from_status (and at version, when given), so retries and concurrent calls
+    change nothing, and the matched rows' days are summed per balance row
+    before the balance UPDATE. Balances are picked by the year of each leave's
+    start date. Returns the ids this call actually moved.
+    """
+    used_delta, remaining_delta = LEAVE_TRANSITIONS[(from_status, to_status)]
+
+    criteria = [Leave.id.in_(leave_ids), Leave.status == from_status]
+    if version is not None:
+        criteria.append(Leave.version == version)
+
+    moved = db.update(Leave).where(*criteria).values(
+        status=to_status,
+        approved_by=actor_id,
+        version=Leave.version + 1,
+        updated_at=datetime.utcnow()
+    ).returning(
+        Leave.id, Leave.user_id, Leave.leave_type, Leave.number_of_days, Leave.start_date
+    ).cte('moved')
+
+    balance_year = db.extract('year', moved.c.start_date)
+    deltas = db.select(
+        moved.c.user_id,
+        moved.c.leave_type,
+        balance_year.label('year'),
+        db.func.sum(moved.c.number_of_days).label('days')
+    ).group_by(moved.c.user_id, moved.c.leave_type, balance_year).cte('deltas')
+
+    balance = db.update(LeaveBalance).where(
+        LeaveBalance.user_id == deltas.c.user_id,
+        LeaveBalance.leave_type == deltas.c.leave_type,
+        LeaveBalance.year == deltas.c.year
+    ).values(
+        used_days=LeaveBalance.used_days + used_delta * deltas.c.days,
+        remaining_days=LeaveBalance.remaining_days + remaining_delta * deltas.c.days
+    ).cte('balance')
+
+    return set(db.session.execute(
+        db.select(moved.c.id).add_cte(balance)
+    ).scalars())
+
+def transition_leave(leave, to_status, actor_id):
+    """Move a single leave, guarded by the status and version that were read"""
+    return bool(transition_leaves([leave.id], leave.status, to_status, actor_id, version=leave.version))
+
+def decide_leave(leave_id, to_status):
+    """Shared body of the approve/reject endpoints"""
+    leave = Leave.query.get(leave_id)
+    if not leave:
+        return jsonify({'error': 'Leave request not found'}), 404
+
+    user = User.query.get(session.get('user_id'))
+    if not can_decide_leave(user, leave):
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    action = 'approved' if to_status == 'Approved' else 'rejected'
+
+    # Retries and double-clicks are no-ops
+    if leave.status == to_status:
+        return jsonify({'message': f'Leave already {action}', 'result': 'unchanged', 'status': leave.status,
+                        'version': leave.version}), 200
+
+    # Optional optimistic check against the version the client last saw
+    data = request.get_json(silent=True) or {}
+    if data.get('version') is not None:
+        try:
+            expected_version = int(data['version'])
+        except (TypeError, ValueError):
+            return jsonify({'error': 'version must be an integer'}), 400
+        if expected_version != leave.version:
+            return jsonify({'error': 'Leave request was modified by someone else, please reload'}), 409
+
+    if (leave.status, to_status) not in LEAVE_TRANSITIONS:
+        return jsonify({'error': f'Cannot change a {leave.status} leave request to {to_status}'}), 409
+
+    from_status = leave.status
+    new_version = leave.version + 1
+    assigned_to = leave.approved_by
+
+    if not transition_leave(leave, to_status, user.id):
+        # Lost a race: report the outcome of whoever won
+        db.session.rollback()
+        db.session.refresh(leave)
+        if leave.status == to_status:
+            return jsonify({'message': f'Leave already {action}', 'result': 'unchanged', 'status': leave.status,
+                            'version': leave.version}), 200
+        return jsonify({'error': f'Leave request is already {leave.status}'}), 409
+
+    db.session.commit()
+    availability_cache.invalidate()
+    if from_status == 'Pending':
+        approver_pool.resolved(assigned_to)
+
+    return jsonify({'message': f'Leave {action} successfully', 'result': action, 'status': to_status,
+                    'version': new_version}), 200
+
+@bp.route('/api/leaves/approve/<int:leave_id>', methods=['PUT'])
+@login_required
+def approve_leave(leave_id):
+    """Approve leave request (Admin, HR Officer or assigned approver)"""
+    return decide_leave(leave_id, 'Approved')
+
+@bp.route('/api/leaves/reject/<int:leave_id>', methods=['PUT'])
+@login_required
+def reject_leave(leave_id):
+    """Reject leave request (Admin, HR Officer or assigned approver)"""
+    return decide_leave(leave_id, 'Rejected')
+
+@bp.route('/api/leaves/batch', methods=['POST'])
+@login_required
+def batch_decide_leaves():
+    """Approve or reject many leave requests in one transaction
+
+    Expects {"leave_ids": [...], "action": "approve" | "reject"} and returns a
+    result per id. Transitions are applied with one set-based statement per
+    source status.
+    """
+    data = request.get_json() or {}
+    action = data.get('action')
+    if action not in ('approve', 'reject'):
+        return jsonify({'error': "action must be 'approve' or 'reject'"}), 400
+
+    try:
+        leave_ids = list(dict.fromkeys(int(leave_id) for leave_id in data.get('leave_ids') or []))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'leave_ids must be a list of integers'}), 400
+    if not leave_ids:
+        return jsonify({'error': 'No leave requests selected'}), 400
+    if len(leave_ids) > MAX_LEAVE_BATCH:
+        return jsonify({'error': f'At most {MAX_LEAVE_BATCH} leave requests per batch'}), 400
+
+    user = User.query.get(session.get('user_id'))
+    to_status = 'Approved' if action == 'approve' else 'Rejected'
+    done = 'approved' if action == 'approve' else 'rejected'
+
+    leaves = {
+        leave.id: leave for leave in db.session.query(
+            Leave.id, Leave.status, Leave.approved_by
+        ).filter(Leave.id.in_(leave_ids))
+    }
+
+    results = {}
+    by_status = {}
+    for leave_id in leave_ids:
+        leave = leaves.get(leave_id)
+        if leave is None:
+            results[leave_id] = {'result': 'not_found', 'error': 'Leave request not found'}
+        elif not can_decide_leave(user, leave):
+            results[leave_id] = {'result': 'unauthorized', 'error': 'Unauthorized'}
+        elif leave.status == to_status:
+            results[leave_id] = {'result': 'unchanged', 'status': leave.status}
+        elif (leave.status, to_status) not in LEAVE_TRANSITIONS:
+            results[leave_id] = {'result': 'conflict', 'status': leave.status,
+                                 'error': f'Cannot change a {leave.status} leave request to {to_status}'}
+        else:
+            by_status.setdefault(leave.status, []).append(leave_id)
+
+    try:
+        moved = set()
+        for from_status, ids in by_status.items():
+            moved |= transition_leaves(ids, from_status, to_status, user.id)
+
+        # Anything not moved was changed by someone else in the meantime
+        lost = [leave_id for ids in by_status.values() for leave_id in ids if leave_id not in moved]
+        current = dict(
+            db.session.query(Leave.id, Leave.status).filter(Leave.id.in_(lost)).all()
+        ) if lost else {}
+
+        db.session.commit()
+        if moved:
+            availability_cache.invalidate()
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+    for leave_id in moved:
+        results[leave_id] = {'result': done, 'status': to_status}
+        if leaves[leave_id].status == 'Pending':
+            approver_pool.resolved(leaves[leave_id].approved_by)
+    for leave_id, status in current.items():
+        results[leave_id] = {'result': 'unchanged' if status == to_status else 'conflict', 'status': status}
+
+    return jsonify({
+        'message': f'{len(moved)} leave request(s) {done}',
+        'results': [dict(id=leave_id, **results[leave_id]) for leave_id in leave_ids]
+    }), 200
+
+def leave_policy_to_dict(policy):
+    return {
+        'id': policy.id,
+        'leave_type': policy.leave_type,
+        'annual_entitlement': policy.annual_entitlement,
+        'accrual_rate': policy.accrual_rate,
+        'carry_forward_cap': policy.carry_forward_cap,
+        'employment_types': policy.employment_types,
+        'contract_types': policy.contract_types,
+        'is_active': policy.is_active
+    }
+
+def apply_leave_policy_fields(policy, data):
+    """Copy editable fields from request data onto a LeavePolicy"""
+    if 'annual_entitlement' in data:
+        policy.annual_entitlement = int(data['annual_entitlement'])
+    if 'accrual_rate' in data:
+        policy.accrual_rate = float(data['accrual_rate']) if data['accrual_rate'] is not None else None
+    if 'carry_forward_cap' in data:
+        policy.carry_forward_cap = int(data['carry_forward_cap'] or 0)
+    for field in ('employment_types', 'contract_types'):
+        if field in data:
+            setattr(policy, field, list(data[field]) if data[field] else None)
+    if 'is_active' in data:
+        policy.is_active = bool(data['is_active'])
+
+@bp.route('/api/leave-policies')
+@login_required
+def list_leave_policies():
+    """List all leave policies"""
+    policies = LeavePolicy.query.order_by(LeavePolicy.id).all()
+    return jsonify(policies=[leave_policy_to_dict(p) for p in policies]), 200
+
+@bp.route('/api/leave-policies', methods=['POST'])
+@login_required
+@role_required('ADMIN', 'HR_OFFICER')
+def create_leave_policy():
+    """Create a leave type and its policy (Admin or HR Officer)"""
+    try:
+        data = request.get_json()
+        leave_type = (data.get('leave_type') or '').strip()
+        if not leave_type or data.get('annual_entitlement') is None:
+            return jsonify({'error': 'leave_type and annual_entitlement are required'}), 400
+        if LeavePolicy.query.filter_by(leave_type=leave_type).first():
+            return jsonify({'error': 'Leave type already exists'}), 400
+
+        policy = LeavePolicy(leave_type=leave_type)
+        apply_leave_policy_fields(policy, data)
+        db.session.add(policy)
+        db.session.commit()
+        leave_policies.invalidate()
+
+        return jsonify({'message': 'Leave policy created successfully', 'policy': leave_policy_to_dict(policy)}), 201
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/leave-policies/<int:policy_id>', methods=['PUT'])
+@login_required
+@role_required('ADMIN', 'HR_OFFICER')
+def update_leave_policy(policy_id):
+    """Edit a leave policy (Admin or HR Officer)"""
+    policy = LeavePolicy.query.get(policy_id)
+    if not policy:
+        return jsonify({'error': 'Leave policy not found'}), 404
+
+    try:
+        apply_leave_policy_fields(policy, request.get_json())
+        db.session.commit()
+        leave_policies.invalidate()
+        return jsonify({'message': 'Leave policy updated successfully', 'policy': leave_policy_to_dict(policy)}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,64 @@
+# WorkZen HRMS - main routes
+
+from flask import Blueprint, redirect, render_template, session, url_for
+from datetime import datetime
+
+from ..database import db, replica_reads
+from ..models import Attendance, Leave, LeaveBalance, Payslip, User
+from ..accounts import login_required
+
+bp = Blueprint('main', __name__)
+
+@bp.route('/')
+def index():
+    return redirect(url_for('auth.login'))
+
+@bp.route('/dashboard')
+@replica_reads
+@login_required
+def dashboard():
+    user = User.query.get(session.get('user_id'))
+    today = datetime.now().date()
+    
+    # Total Employees
+    total_employees = User.query.filter_by(role='EMPLOYEE', is_active=True).count()
+    
+    # Attendance Rate (percentage of present today)
+    total_present_today = Attendance.query.filter_by(attendance_date=today, status='Present').count()
+    total_employees_active = User.query.filter_by(is_active=True).count()
+    attendance_rate = round((total_present_today / total_employees_active * 100) if total_employees_active > 0 else 0)
+    
+    # Pending Leaves
+    pending_leaves = Leave.query.filter_by(status='Pending').count()
+    
+    # Total Payroll (sum of all net salaries for current month)
+    current_month = today.replace(day=1)
+    total_payroll = db.session.query(db.func.sum(Payslip.net_salary)).filter_by(payroll_month=current_month).scalar() or 0
+    total_payroll = round(total_payroll / 100000, 1)  # Convert to Lakhs
+    
+    # Today's Attendance (for logged-in employee)
+    today_attendance = Attendance.query.filter_by(user_id=user.id, attendance_date=today).first()
+    
+    # Leave Balance
+    leave_balance = LeaveBalance.query.filter_by(user_id=user.id, year=today.year).all()
+    
+    # Recent Payslips
+    recent_payslips = Payslip.query.filter_by(user_id=user.id).order_by(Payslip.payroll_month.desc()).limit(3).all()
+    
+    return render_template('dashboard.html', 
+                         user=user,
+                         total_employees=total_employees,
+                         attendance_rate=attendance_rate,
+                         pending_leaves=pending_leaves,
+                         total_payroll=total_payroll,
+                         today_attendance=today_attendance,
+                         leave_balance=leave_balance,
+                         recent_payslips=recent_payslips)
+
+@bp.app_errorhandler(404)
+def not_found(error):
+    return render_template('404.html'), 404
+
+@bp.app_errorhandler(500)
+def internal_error(error):
+    return render_template('500.html'), 500
@@ -0,0 +1,483 @@
+# WorkZen HRMS - payroll routes
+
+from flask import Blueprint, jsonify, render_template, request, send_file, session
+from datetime import datetime, timedelta
+from io import BytesIO
+import csv
+
+from ..database import db, replica_reads, reporting_queries
+from ..models import Attendance, Leave, Payslip, PayslipStatus, SalaryAdjustment, User, enum_filter
+from ..accounts import login_required, role_required
+from ..caches import company_calendar, department_id_arg, departments
+from ..services import payslip_amounts
+from ..search import employee_search_clause
+
+bp = Blueprint('payroll', __name__)
+
+@bp.route('/payroll')
+@login_required
+def payroll():
+    """Main payroll page - shows own payslips for employees, overview for admin/payroll officer"""
+    user_id = session.get('user_id')
+    user = User.query.get(user_id)
+    
+    # Get payslips for current user
+    payslips = Payslip.query.filter_by(user_id=user_id).order_by(
+        Payslip.payroll_month.desc()
+    ).limit(12).all()
+    
+    # Get current month payslip
+    current_month = datetime.now().replace(day=1).date()
+    current_payslip = Payslip.query.filter_by(
+        user_id=user_id,
+        payroll_month=current_month
+    ).first()
+    
+    # Get salary adjustments
+    salary_adjustments = SalaryAdjustment.query.filter_by(
+        user_id=user_id
+    ).order_by(SalaryAdjustment.adjustment_date.desc()).limit(5).all()
+    
+    # For Admin/Payroll Officer - get statistics
+    total_employees = None
+    total_payroll_current = None
+    processed_payslips = None
+    pending_payslips = None
+    
+    if user.role in ['ADMIN', 'PAYROLL_OFFICER']:
+        total_employees = User.query.filter_by(is_active=True).count()
+        
+        # Get current month payroll total
+        current_month_payslips = Payslip.query.filter_by(
+            payroll_month=current_month
+        ).all()
+        total_payroll_current = sum(p.net_salary or 0 for p in current_month_payslips)
+        
+        processed_payslips = Payslip.query.filter_by(
+            payroll_month=current_month,
+            status='Processed'
+        ).count()
+        
+        pending_payslips = Payslip.query.filter_by(
+            payroll_month=current_month,
+            status='Draft'
+        ).count()
+    
+    return render_template('payroll.html',
+                         user=user,
+                         payslips=payslips,
+                         current_payslip=current_payslip,
+                         salary_adjustments=salary_adjustments,
+                         total_employees=total_employees,
+                         total_payroll_current=total_payroll_current,
+                         processed_payslips=processed_payslips,
+                         pending_payslips=pending_payslips)
+
+@bp.route('/payroll/generate')
+@login_required
+@role_required('ADMIN', 'PAYROLL_OFFICER')
+def generate_payroll_page():
+    """Generate payroll page"""
+    user = User.query.get(session.get('user_id'))
+    
+    # Get all active employees
+    employees = User.query.filter_by(is_active=True).all()
+    
+    # Calculate estimates
+    total_basic_salary = sum(emp.basic_salary or 0 for emp in employees)
+    estimated_gross = total_basic_salary * 1.25  # Basic + HRA + DA
+    estimated_deductions = total_basic_salary * 0.22  # PF + Tax + Prof Tax
+    estimated_net = estimated_gross - estimated_deductions
+    
+    return render_template('generate_payroll.html',
+                         user=user,
+                         employees=employees,
+                         departments=departments.all(),
+                         total_basic_salary=total_basic_salary,
+                         estimated_gross=estimated_gross,
+                         estimated_deductions=estimated_deductions,
+                         estimated_net=estimated_net)
+
+@bp.route('/api/payroll/generate', methods=['POST'])
+@login_required
+@role_required('ADMIN', 'PAYROLL_OFFICER')
+def generate_payroll():
+    """Generate payslips for employees"""
+    try:
+        data = request.get_json()
+        payroll_month_str = data.get('payroll_month')
+        department_id = department_id_arg(data.get('department'))
+        include_inactive = data.get('include_inactive', False)
+        
+        # Parse payroll month
+        payroll_month = datetime.strptime(payroll_month_str, '%Y-%m-%d').date()
+        
+        # Query employees
+        query = User.query
+        if not include_inactive:
+            query = query.filter_by(is_active=True)
+        if department_id is not None:
+            query = query.filter_by(department_id=department_id)
+        
+        employees = query.all()
+        
+        generated_count = 0
+        skipped_count = 0
+        
+        for employee in employees:
+            # Check if payslip already exists
+            existing = Payslip.query.filter_by(
+                user_id=employee.id,
+                payroll_month=payroll_month
+            ).first()
+            
+            if existing:
+                skipped_count += 1
+                continue
+            
+            # Calculate attendance for the month
+            month_start = payroll_month.replace(day=1)
+            if payroll_month.month == 12:
+                next_month = payroll_month.replace(year=payroll_month.year + 1, month=1, day=1)
+            else:
+                next_month = payroll_month.replace(month=payroll_month.month + 1, day=1)
+            
+            attendance_count = Attendance.query.filter(
+                Attendance.user_id == employee.id,
+                Attendance.attendance_date >= month_start,
+                Attendance.attendance_date < next_month,
+                Attendance.status == 'Present'
+            ).count()
+            
+            # Create payslip
+            payslip = Payslip(
+                user_id=employee.id,
+                payroll_month=payroll_month,
+                **payslip_amounts(employee.basic_salary or 0),
+                status='Processed',
+                processed_date=datetime.now()
+            )
+            
+            db.session.add(payslip)
+            generated_count += 1
+        
+        db.session.commit()
+        
+        return jsonify({
+            'message': f'Payroll generated successfully! {generated_count} payslips created, {skipped_count} skipped (already exists)',
+            'generated': generated_count,
+            'skipped': skipped_count
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/payroll/payslip/<int:payslip_id>')
+@login_required
+def view_payslip(payslip_id):
+    """View detailed payslip"""
+    payslip = Payslip.query.get_or_404(payslip_id)
+    employee = User.query.get(payslip.user_id)
+    
+    # Check access - users can only view their own payslips unless they're admin/payroll officer
+    user = User.query.get(session.get('user_id'))
+    if user.role not in ['ADMIN', 'PAYROLL_OFFICER'] and payslip.user_id != user.id:
+        return "Unauthorized", 403
+    
+    # Calculate attendance statistics for the month
+    month_start = payslip.payroll_month.replace(day=1)
+    if payslip.payroll_month.month == 12:
+        next_month = payslip.payroll_month.replace(year=payslip.payroll_month.year + 1, month=1, day=1)
+    else:
+        next_month = payslip.payroll_month.replace(month=payslip.payroll_month.month + 1, day=1)
+    
+    # Working days come from the precomputed company calendar
+    working_days = company_calendar.working_days(month_start, next_month - timedelta(days=1))
+
+    # Attendance and approved leave totals for the month in one round trip
+    leave_days = db.session.query(
+        db.func.coalesce(db.func.sum(Leave.number_of_days), 0)
+    ).filter(
+        Leave.user_id == employee.id,
+        Leave.status == 'Approved',
+        Leave.start_date >= month_start,
+        Leave.start_date < next_month
+    ).scalar_subquery()
+
+    present_days, absent_days, leave_days = db.session.query(
+        db.func.count(Attendance.id).filter(Attendance.status == 'Present'),
+        db.func.count(Attendance.id).filter(Attendance.status == 'Absent'),
+        leave_days
+    ).filter(
+        Attendance.user_id == employee.id,
+        Attendance.attendance_date >= month_start,
+        Attendance.attendance_date < next_month
+    ).one()
+    
+    attendance_stats = {
+        'working_days': working_days,
+        'present_days': present_days,
+        'absent_days': absent_days,
+        'leave_days': int(leave_days)
+    }
+    
+    return render_template('view_payslip.html',
+                         payslip=payslip,
+                         employee=employee,
+                         user=user,
+                         attendance_stats=attendance_stats)
+
+@bp.route('/api/payslip/<int:payslip_id>/download')
+@login_required
+def download_payslip_pdf(payslip_id):
+    """Download payslip as PDF"""
+    # ReportLab is imported on first use: it is slow to import and only the PDF downloads need it
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+
+    payslip = Payslip.query.get_or_404(payslip_id)
+    employee = User.query.get(payslip.user_id)
+    
+    # Check access
+    user = User.query.get(session.get('user_id'))
+    if user.role not in ['ADMIN', 'PAYROLL_OFFICER'] and payslip.user_id != user.id:
+        return "Unauthorized", 403
+    
+    # Create PDF
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    elements = []
+    
+    # Styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#3498db'),
+        spaceAfter=30,
+        alignment=1
+    )
+    
+    # Title
+    title = Paragraph(f"Salary Slip - {employee.full_name}", title_style)
+    elements.append(title)
+    elements.append(Spacer(1, 12))
+    
+    # Employee Info
+    info_data = [
+        ['Employee Information', ''],
+        ['Name:', employee.full_name],
+        ['Employee ID:', employee.login_id],
+        ['Department:', employee.department or 'N/A'],
+        ['Position:', employee.job_position or 'N/A'],
+        ['Pay Period:', payslip.payroll_month.strftime('%B %Y')],
+    ]
+    
+    info_table = Table(info_data, colWidths=[2*inch, 4*inch])
+    info_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    elements.append(info_table)
+    elements.append(Spacer(1, 20))
+    
+    # Earnings
+    earnings_data = [
+        ['Earnings', 'Amount (₹)'],
+        ['Basic Salary', f"{payslip.basic_salary:,.2f}"],
+        ['HRA', f"{payslip.hra:,.2f}"],
+        ['DA', f"{payslip.da:,.2f}"],
+        ['Gross Earnings', f"{payslip.gross_earnings:,.2f}"],
+    ]
+    
+    earnings_table = Table(earnings_data, colWidths=[4*inch, 2*inch])
+    earnings_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.green),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    elements.append(earnings_table)
+    elements.append(Spacer(1, 20))
+    
+    # Deductions
+    deductions_data = [
+        ['Deductions', 'Amount (₹)'],
+        ['Provident Fund (PF)', f"{payslip.pf:,.2f}"],
+        ['Income Tax', f"{payslip.income_tax:,.2f}"],
+        ['Professional Tax', f"{payslip.professional_tax:,.2f}"],
+        ['Total Deductions', f"{(payslip.pf + payslip.income_tax + payslip.professional_tax):,.2f}"],
+    ]
+    
+    deductions_table = Table(deductions_data, colWidths=[4*inch, 2*inch])
+    deductions_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.red),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    elements.append(deductions_table)
+    elements.append(Spacer(1, 20))
+    
+    # Net Pay
+    net_data = [
+        ['NET PAY', f"₹ {payslip.net_salary:,.2f}"],
+    ]
+    
+    net_table = Table(net_data, colWidths=[4*inch, 2*inch])
+    net_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#4CAF50')),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 16),
+        ('GRID', (0, 0), (-1, -1), 2, colors.black)
+    ]))
+    elements.append(net_table)
+    
+    # Build PDF
+    doc.build(elements)
+    buffer.seek(0)
+    
+    return send_file(
+        buffer,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=f'payslip_{employee.login_id}_{payslip.payroll_month.strftime("%B_%Y")}.pdf'
+    )
+
+@bp.route('/payroll/salary-adjustments')
+@login_required
+def salary_adjustments():
+    # Put your logic here, e.g.
+    user = User.query.get(session.get('user_id'))
+    adjustments = SalaryAdjustment.query.order_by(SalaryAdjustment.adjustment_date.desc()).all()
+    return render_template('salary_adjustments.html', user=user, adjustments=adjustments)
+
+@bp.route('/payroll/all-payslips')
+@replica_reads
+@login_required
+@role_required('ADMIN', 'PAYROLL_OFFICER')
+def all_payslips_page():
+    """All employee payslips page"""
+    user = User.query.get(session.get('user_id'))
+    
+    # Get filters
+    search = request.args.get('search', '')
+    month = request.args.get('month')
+    department_id = department_id_arg(request.args.get('department'))
+    status = request.args.get('status')
+    
+    # Build query
+    query = Payslip.query.join(User)
+    
+    if search:
+        query = query.filter(employee_search_clause(search))
+    if month:
+        month_date = datetime.strptime(month + '-01', '%Y-%m-%d').date()
+        query = query.filter(Payslip.payroll_month == month_date)
+    if department_id is not None:
+        query = query.filter(User.department_id == department_id)
+    if status:
+        query = query.filter(enum_filter(Payslip.status, PayslipStatus, status))
+    
+    payslips = query.order_by(Payslip.payroll_month.desc()).all()
+    
+    # Calculate statistics
+    total_payslips = len(payslips)
+    processed_count = sum(1 for p in payslips if p.status == 'Processed')
+    draft_count = sum(1 for p in payslips if p.status == 'Draft')
+    total_amount = sum(p.net_salary or 0 for p in payslips)
+    
+    return render_template('all_payslips.html',
+                         user=user,
+                         payslips=payslips,
+                         total_payslips=total_payslips,
+                         processed_count=processed_count,
+                         draft_count=draft_count,
+                         total_amount=total_amount,
+                         departments=departments.all())
+
+@bp.route('/api/payslips/export')
+@reporting_queries
+@login_required
+@role_required('ADMIN', 'PAYROLL_OFFICER')
+def export_payslips():
+    """Export payslips to CSV"""
+    # Get same filters as all_payslips_page
+    search = request.args.get('search', '')
+    month = request.args.get('month')
+    department_id = department_id_arg(request.args.get('department'))
+    status = request.args.get('status')
+    
+    # Build query
+    query = Payslip.query.join(User)
+    
+    if search:
+        query = query.filter(employee_search_clause(search))
+    if month:
+        month_date = datetime.strptime(month + '-01', '%Y-%m-%d').date()
+        query = query.filter(Payslip.payroll_month == month_date)
+    if department_id is not None:
+        query = query.filter(User.department_id == department_id)
+    if status:
+        query = query.filter(enum_filter(Payslip.status, PayslipStatus, status))
+    
+    payslips = query.order_by(Payslip.payroll_month.desc()).all()
+    
+    # Create CSV
+    output = BytesIO()
+    writer = csv.writer(output)
+    
+    # Write header
+    writer.writerow([
+        'Employee ID', 'Employee Name', 'Department', 'Month',
+        'Basic Salary', 'HRA', 'DA', 'Gross Earnings',
+        'PF', 'Income Tax', 'Professional Tax', 'Net Salary', 'Status'
+    ])
+    
+    # Write data
+    for payslip in payslips:
+        writer.writerow([
+            payslip.employee.login_id,
+            payslip.employee.full_name,
+            payslip.employee.department or '',
+            payslip.payroll_month.strftime('%B %Y'),
+            payslip.basic_salary or 0,
+            payslip.hra or 0,
+            payslip.da or 0,
+            payslip.gross_earnings or 0,
+            payslip.pf or 0,
+            payslip.income_tax or 0,
+            payslip.professional_tax or 0,
+            payslip.net_salary or 0,
+            payslip.status
+        ])
+    
+    output.seek(0)
+    
+    return send_file(
+        output,
+        mimetype='text/csv',
+        as_attachment=True,
+        download_name=f'payslips_export_{datetime.now().strftime("%Y%m%d")}.csv'
+    )
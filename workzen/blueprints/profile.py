@@ -0,0 +1,108 @@
+# WorkZen HRMS - profile routes
+
+from flask import Blueprint, abort, jsonify, make_response, render_template, request, session
+import hashlib
+import os
+
+from ..config import ROOT_PATH
+from ..database import db
+from ..models import User
+from ..accounts import login_required
+
+bp = Blueprint('profile', __name__)
+
+@bp.route('/employees/<int:user_id>')
+@login_required
+def employee_profile(user_id):
+    """View individual employee profile"""
+    return profile_response(user_id)
+
+# Template files whose markup the profile ETag must cover
+PROFILE_TEMPLATES = ('base.html', 'profile.html')
+
+PROFILE_TEMPLATE_STAMP = max(
+    int(os.path.getmtime(os.path.join(ROOT_PATH, 'templates', name))) for name in PROFILE_TEMPLATES
+)
+
+def load_profile(user_id):
+    """User with badges and certifications, or None.
+
+    Both lists are short, so they are joined into the user query. Salary
+    history grows with tenure and is lazy-loaded only when the page renders.
+    """
+    return db.session.execute(
+        db.select(User).options(
+            db.joinedload(User.badges),
+            db.joinedload(User.certifications)
+        ).where(User.id == user_id)
+    ).unique().scalar_one_or_none()
+
+def profile_response(user_id):
+    """Render profile.html for user_id, or 304 if the client's copy is current.
+
+    The ETag covers the profile version, the viewer (the page shows
+    role-dependent sections) and the templates. The version comes from the
+    profile query itself: an unchanged profile costs that one query, a
+    changed one adds the salary history query.
+    """
+    user = load_profile(user_id)
+    if user is None:
+        abort(404)
+    etag = hashlib.sha1(
+        f"{user_id}:{user.profile_version}:{session.get('user_id')}:{session.get('role')}:{PROFILE_TEMPLATE_STAMP}".encode()
+    ).hexdigest()
+
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(render_template('profile.html',
+                                                  user=user,
+                                                  salary_adjustments=user.adjusted_salaries,
+                                                  badges=user.badges,
+                                                  certifications=user.certifications))
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+@bp.route('/profile')
+@login_required
+def profile():
+    """Employee profile page (own profile)"""
+    return profile_response(session.get('user_id'))
+
+@bp.route('/settings')
+@login_required
+def settings():
+    """Settings / Account page (own account)"""
+    user = User.query.get(session.get('user_id'))
+    return render_template('settings.html', user=user)
+
+@bp.route('/api/settings/change-password', methods=['POST'])
+@login_required
+def change_password():
+    """Change password (own account)"""
+    user = User.query.get(session.get('user_id'))
+    data = request.get_json()
+    old_password = data.get('old_password')
+    new_password = data.get('new_password')
+
+    if not user.check_password(old_password):
+        return jsonify({'error': 'Old password is incorrect'}), 401
+
+    user.set_password(new_password)
+    db.session.commit()
+    return jsonify({'message': 'Password changed successfully'}), 200
+
+@bp.route('/api/settings/update-profile', methods=['PUT'])
+@login_required
+def update_profile():
+    """Update profile settings (own account)"""
+    user = User.query.get(session.get('user_id'))
+    data = request.get_json()
+    user.phone = data.get('phone', user.phone)
+    user.date_of_birth = data.get('date_of_birth', user.date_of_birth)
+    user.gender = data.get('gender', user.gender)
+    user.nationality = data.get('nationality', user.nationality)
+    db.session.commit()
+    return jsonify({'message': 'Profile updated successfully'}), 200
@@ -0,0 +1,532 @@
+# WorkZen HRMS - reports routes
+
+from flask import Blueprint, render_template, request, send_file, session
+from datetime import datetime, timedelta
+from io import BytesIO
+import csv
+
+from ..database import db, replica_reads, reporting_queries
+from ..models import Attendance, Department, Leave, Payslip, User
+from ..accounts import login_required, role_required
+from ..caches import department_id_arg, departments
+
+bp = Blueprint('reports', __name__)
+
+@bp.route('/reports/<report_type>')
+@replica_reads
+@login_required
+@role_required('ADMIN', 'PAYROLL_OFFICER')
+def report_detail(report_type):
+    # Render your detailed report here
+    return render_template('report_detail.html', report_type=report_type, departments=departments.all(),
+                           department=department_id_arg(request.args.get('department')))
+
+@bp.route('/reports')
+@reporting_queries
+@login_required
+@role_required('ADMIN', 'PAYROLL_OFFICER')
+def reports():
+    """Reports page (Admin or Payroll Officer)"""
+    user = User.query.get(session.get('user_id'))
+
+    today = datetime.now().date()
+    month_start = today.replace(day=1)
+
+    # One pass over this month's attendance, grouped by department key
+    rows = db.session.execute(
+        db.select(
+            Department.name,
+            db.func.count(Attendance.id).filter(Attendance.status == 'Present'),
+            db.func.count(Attendance.id).filter(Attendance.status == 'Absent'),
+            db.func.count(Attendance.id).filter(Attendance.status == 'Late')
+        ).join(User, User.department_id == Department.id).outerjoin(Attendance, db.and_(
+            Attendance.user_id == User.id,
+            Attendance.attendance_date >= month_start
+        )).group_by(Department.id, Department.name).order_by(Department.name)
+    )
+
+    attendance_data = {}
+    for name, present, absent, late in rows:
+        total = present + absent + late
+        attendance_pct = (present / total * 100) if total > 0 else 0
+        attendance_data[name] = {
+            'present': present, 'absent': absent, 'late': late,
+            'percentage': round(attendance_pct, 1)
+        }
+
+    return render_template('reports.html', user=user, attendance_data=attendance_data)
+
+def generate_attendance_report(start_date, end_date, department_id=None):
+    """Generate attendance report data"""
+    query = db.session.query(
+        Attendance, User
+    ).join(User).filter(
+        Attendance.attendance_date >= start_date,
+        Attendance.attendance_date <= end_date
+    )
+    
+    if department_id is not None:
+        query = query.filter(User.department_id == department_id)
+    
+    records = query.all()
+    
+    # Calculate statistics
+    total_records = len(records)
+    present = sum(1 for r in records if r[0].status == 'Present')
+    absent = sum(1 for r in records if r[0].status == 'Absent')
+    late = sum(1 for r in records if r[0].status == 'Late')
+    avg_hours = sum(r[0].working_hours or 0 for r in records) / total_records if total_records > 0 else 0
+    
+    summary_stats = [
+        {'icon': '📊', 'value': total_records, 'label': 'Total Records'},
+        {'icon': '✅', 'value': present, 'label': 'Present Days'},
+        {'icon': '❌', 'value': absent, 'label': 'Absent Days'},
+        {'icon': '⏰', 'value': f'{avg_hours:.1f}h', 'label': 'Avg Working Hours'}
+    ]
+    
+    table_headers = ['Date', 'Employee ID', 'Name', 'Department', 'Check In', 'Check Out', 'Hours', 'Status']
+    table_data = []
+    
+    for att, user in records:
+        table_data.append([
+            att.attendance_date.strftime('%d %b %Y'),
+            user.login_id,
+            user.full_name,
+            user.department or '-',
+            att.check_in.strftime('%I:%M %p') if att.check_in else '-',
+            att.check_out.strftime('%I:%M %p') if att.check_out else '-',
+            f'{att.working_hours:.2f}' if att.working_hours else '-',
+            att.status
+        ])
+    
+    return {
+        'summary_stats': summary_stats,
+        'table_headers': table_headers,
+        'table_data': table_data,
+        'show_chart': True,
+        'chart_title': 'Attendance Trends'
+    }
+
+def generate_payroll_report(start_date, end_date, department_id=None):
+    """Generate payroll report data"""
+    query = db.session.query(
+        Payslip, User
+    ).join(User).filter(
+        Payslip.payroll_month >= start_date,
+        Payslip.payroll_month <= end_date
+    )
+    
+    if department_id is not None:
+        query = query.filter(User.department_id == department_id)
+    
+    records = query.all()
+    
+    # Calculate statistics
+    total_payslips = len(records)
+    total_gross = sum(r[0].gross_earnings or 0 for r in records)
+    total_deductions = sum((r[0].pf or 0) + (r[0].income_tax or 0) + (r[0].professional_tax or 0) for r in records)
+    total_net = sum(r[0].net_salary or 0 for r in records)
+    
+    summary_stats = [
+        {'icon': '💰', 'value': f'₹{total_gross:,.0f}', 'label': 'Total Gross'},
+        {'icon': '💸', 'value': f'₹{total_deductions:,.0f}', 'label': 'Total Deductions'},
+        {'icon': '💵', 'value': f'₹{total_net:,.0f}', 'label': 'Total Net Pay'},
+        {'icon': '👥', 'value': total_payslips, 'label': 'Employees Paid'}
+    ]
+    
+    table_headers = ['Month', 'Employee ID', 'Name', 'Basic Salary', 'HRA', 'Gross', 'Deductions', 'Net Salary']
+    table_data = []
+    
+    for payslip, user in records:
+        deductions = (payslip.pf or 0) + (payslip.income_tax or 0) + (payslip.professional_tax or 0)
+        table_data.append([
+            payslip.payroll_month.strftime('%b %Y'),
+            user.login_id,
+            user.full_name,
+            f'₹{payslip.basic_salary:,.2f}' if payslip.basic_salary else '-',
+            f'₹{payslip.hra:,.2f}' if payslip.hra else '-',
+            f'₹{payslip.gross_earnings:,.2f}' if payslip.gross_earnings else '-',
+            f'₹{deductions:,.2f}',
+            f'₹{payslip.net_salary:,.2f}' if payslip.net_salary else '-'
+        ])
+    
+    return {
+        'summary_stats': summary_stats,
+        'table_headers': table_headers,
+        'table_data': table_data,
+        'show_chart': True,
+        'chart_title': 'Payroll Distribution'
+    }
+
+def generate_employee_report(department_id=None):
+    """Generate employee report data"""
+    query = User.query.filter(User.is_active == True)
+    
+    if department_id is not None:
+        query = query.filter(User.department_id == department_id)
+    
+    employees = query.all()
+    
+    # Calculate statistics
+    total_employees = len(employees)
+    by_role = {}
+    for emp in employees:
+        by_role[emp.role] = by_role.get(emp.role, 0) + 1
+    
+    summary_stats = [
+        {'icon': '👥', 'value': total_employees, 'label': 'Total Employees'},
+        {'icon': '💼', 'value': by_role.get('EMPLOYEE', 0), 'label': 'Employees'},
+        {'icon': '👔', 'value': by_role.get('HR_OFFICER', 0), 'label': 'HR Officers'},
+        {'icon': '🔧', 'value': by_role.get('ADMIN', 0), 'label': 'Admins'}
+    ]
+    
+    table_headers = ['Employee ID', 'Name', 'Department', 'Position', 'Role', 'Joining Date', 'Email', 'Phone']
+    table_data = []
+    
+    for emp in employees:
+        table_data.append([
+            emp.login_id,
+            emp.full_name,
+            emp.department or '-',
+            emp.job_position or '-',
+            emp.role.replace('_', ' ').title(),
+            emp.date_of_joining.strftime('%d %b %Y') if emp.date_of_joining else '-',
+            emp.email,
+            emp.phone or '-'
+        ])
+    
+    return {
+        'summary_stats': summary_stats,
+        'table_headers': table_headers,
+        'table_data': table_data,
+        'show_chart': False
+    }
+
+def generate_leave_report(start_date, end_date, department_id=None):
+    """Generate leave report data"""
+    query = db.session.query(
+        Leave, User
+    ).join(User).filter(
+        Leave.start_date >= start_date,
+        Leave.start_date <= end_date
+    )
+    
+    if department_id is not None:
+        query = query.filter(User.department_id == department_id)
+    
+    records = query.all()
+    
+    # Calculate statistics
+    total_leaves = len(records)
+    approved = sum(1 for r in records if r[0].status == 'Approved')
+    pending = sum(1 for r in records if r[0].status == 'Pending')
+    rejected = sum(1 for r in records if r[0].status == 'Rejected')
+    
+    summary_stats = [
+        {'icon': '📋', 'value': total_leaves, 'label': 'Total Requests'},
+        {'icon': '✅', 'value': approved, 'label': 'Approved'},
+        {'icon': '⏳', 'value': pending, 'label': 'Pending'},
+        {'icon': '❌', 'value': rejected, 'label': 'Rejected'}
+    ]
+    
+    table_headers = ['Employee ID', 'Name', 'Leave Type', 'Start Date', 'End Date', 'Days', 'Status', 'Reason']
+    table_data = []
+    
+    for leave, user in records:
+        table_data.append([
+            user.login_id,
+            user.full_name,
+            leave.leave_type,
+            leave.start_date.strftime('%d %b %Y'),
+            leave.end_date.strftime('%d %b %Y'),
+            leave.number_of_days,
+            leave.status,
+            leave.reason[:50] + '...' if leave.reason and len(leave.reason) > 50 else leave.reason or '-'
+        ])
+    
+    return {
+        'summary_stats': summary_stats,
+        'table_headers': table_headers,
+        'table_data': table_data,
+        'show_chart': True,
+        'chart_title': 'Leave Trends'
+    }
+
+def generate_overtime_report(start_date, end_date, department_id=None):
+    """Generate overtime report data"""
+    query = db.session.query(
+        Attendance, User
+    ).join(User).filter(
+        Attendance.attendance_date >= start_date,
+        Attendance.attendance_date <= end_date,
+        Attendance.working_hours > 8
+    )
+    
+    if department_id is not None:
+        query = query.filter(User.department_id == department_id)
+    
+    records = query.all()
+    
+    # Calculate statistics
+    total_overtime_days = len(records)
+    total_overtime_hours = sum(max(0, (r[0].working_hours or 0) - 8) for r in records)
+    avg_overtime = total_overtime_hours / total_overtime_days if total_overtime_days > 0 else 0
+    
+    summary_stats = [
+        {'icon': '⏰', 'value': total_overtime_days, 'label': 'Overtime Days'},
+        {'icon': '⏱️', 'value': f'{total_overtime_hours:.1f}h', 'label': 'Total OT Hours'},
+        {'icon': '📊', 'value': f'{avg_overtime:.1f}h', 'label': 'Avg OT/Day'},
+        {'icon': '💰', 'value': f'₹{total_overtime_hours * 200:.0f}', 'label': 'Estimated Cost'}
+    ]
+    
+    table_headers = ['Date', 'Employee ID', 'Name', 'Department', 'Working Hours', 'OT Hours']
+    table_data = []
+    
+    for att, user in records:
+        ot_hours = max(0, (att.working_hours or 0) - 8)
+        table_data.append([
+            att.attendance_date.strftime('%d %b %Y'),
+            user.login_id,
+            user.full_name,
+            user.department or '-',
+            f'{att.working_hours:.2f}' if att.working_hours else '-',
+            f'{ot_hours:.2f}'
+        ])
+    
+    return {
+        'summary_stats': summary_stats,
+        'table_headers': table_headers,
+        'table_data': table_data,
+        'show_chart': True,
+        'chart_title': 'Overtime Trends'
+    }
+
+def generate_performance_report(start_date, end_date, department_id=None):
+    """Generate performance report data (placeholder)"""
+    query = User.query.filter(User.is_active == True)
+    
+    if department_id is not None:
+        query = query.filter(User.department_id == department_id)
+    
+    employees = query.all()
+    
+    summary_stats = [
+        {'icon': '⭐', 'value': len(employees), 'label': 'Employees Evaluated'},
+        {'icon': '🏆', 'value': '85%', 'label': 'Avg Score'},
+        {'icon': '📈', 'value': '12', 'label': 'Top Performers'},
+        {'icon': '📉', 'value': '3', 'label': 'Need Improvement'}
+    ]
+    
+    table_headers = ['Employee ID', 'Name', 'Department', 'Performance Score', 'Attendance %', 'Rating']
+    table_data = []
+    
+    # This is placeholder data - in real scenario, you'd calculate from actual performance metrics
+    for emp in employees[:20]:  # Limit to 20 for demo
+        table_data.append([
+            emp.login_id,
+            emp.full_name,
+            emp.department or '-',
+            f'{85 + (hash(emp.id) % 15)}%',
+            f'{90 + (hash(emp.id) % 10)}%',
+            '⭐' * (3 + (hash(emp.id) % 3))
+        ])
+    
+    return {
+        'summary_stats': summary_stats,
+        'table_headers': table_headers,
+        'table_data': table_data,
+        'show_chart': True,
+        'chart_title': 'Performance Distribution'
+    }
+
+@bp.route('/api/reports/download/<report_type>/pdf')
+@reporting_queries
+@login_required
+@role_required('ADMIN', 'PAYROLL_OFFICER')
+def download_report_pdf(report_type):
+    """Download report as PDF"""
+    # ReportLab is imported on first use: it is slow to import and only the PDF downloads need it
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+
+    # Get filter parameters
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    department_id = department_id_arg(request.args.get('department'))
+    
+    # Set default dates
+    if not end_date:
+        end_date = datetime.now().date()
+    else:
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+    
+    if not start_date:
+        start_date = end_date - timedelta(days=30)
+    else:
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+    
+    # Generate report data
+    if report_type == 'attendance':
+        data = generate_attendance_report(start_date, end_date, department_id)
+    elif report_type == 'payroll':
+        data = generate_payroll_report(start_date, end_date, department_id)
+    elif report_type == 'employee':
+        data = generate_employee_report(department_id)
+    elif report_type == 'leave':
+        data = generate_leave_report(start_date, end_date, department_id)
+    elif report_type == 'overtime':
+        data = generate_overtime_report(start_date, end_date, department_id)
+    elif report_type == 'performance':
+        data = generate_performance_report(start_date, end_date, department_id)
+    else:
+        return "Invalid report type", 404
+    
+    # Create PDF
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    elements = []
+    
+    # Styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#3498db'),
+        spaceAfter=30,
+        alignment=1  # Center
+    )
+    
+    # Title
+    title = Paragraph(f"{report_type.title()} Report", title_style)
+    elements.append(title)
+    elements.append(Spacer(1, 12))
+    
+    # Date range
+    date_text = Paragraph(
+        f"Period: {start_date.strftime('%d %b %Y')} - {end_date.strftime('%d %b %Y')}",
+        styles['Normal']
+    )
+    elements.append(date_text)
+    elements.append(Spacer(1, 20))
+    
+    # Summary stats
+    summary_data = [['Metric', 'Value']]
+    for stat in data['summary_stats']:
+        summary_data.append([stat['label'], str(stat['value'])])
+    
+    summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    elements.append(summary_table)
+    elements.append(Spacer(1, 30))
+    
+    # Detailed table (limit to first 50 rows for PDF)
+    table_data = [data['table_headers']]
+    table_data.extend(data['table_data'][:50])
+    
+    # Adjust column widths based on number of columns
+    col_count = len(data['table_headers'])
+    col_width = 7.5*inch / col_count
+    
+    detail_table = Table(table_data, colWidths=[col_width] * col_count)
+    detail_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    elements.append(detail_table)
+    
+    # Build PDF
+    doc.build(elements)
+    buffer.seek(0)
+    
+    return send_file(
+        buffer,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=f'{report_type}_report_{datetime.now().strftime("%Y%m%d")}.pdf'
+    )
+
+@bp.route('/api/reports/download/<report_type>/excel')
+@reporting_queries
+@login_required
+@role_required('ADMIN', 'PAYROLL_OFFICER')
+def download_report_excel(report_type):
+    """Download report as Excel (CSV)"""
+    # Get filter parameters
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    department_id = department_id_arg(request.args.get('department'))
+    
+    # Set default dates
+    if not end_date:
+        end_date = datetime.now().date()
+    else:
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+    
+    if not start_date:
+        start_date = end_date - timedelta(days=30)
+    else:
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+    
+    # Generate report data
+    if report_type == 'attendance':
+        data = generate_attendance_report(start_date, end_date, department_id)
+    elif report_type == 'payroll':
+        data = generate_payroll_report(start_date, end_date, department_id)
+    elif report_type == 'employee':
+        data = generate_employee_report(department_id)
+    elif report_type == 'leave':
+        data = generate_leave_report(start_date, end_date, department_id)
+    elif report_type == 'overtime':
+        data = generate_overtime_report(start_date, end_date, department_id)
+    elif report_type == 'performance':
+        data = generate_performance_report(start_date, end_date, department_id)
+    else:
+        return "Invalid report type", 404
+    
+    # Create CSV
+    output = BytesIO()
+    writer = csv.writer(output)
+    
+    # Write header
+    writer.writerow([f"{report_type.title()} Report"])
+    writer.writerow([f"Period: {start_date.strftime('%d %b %Y')} - {end_date.strftime('%d %b %Y')}"])
+    writer.writerow([])
+    
+    # Write summary
+    writer.writerow(['Summary Statistics'])
+    for stat in data['summary_stats']:
+        writer.writerow([stat['label'], stat['value']])
+    writer.writerow([])
+    
+    # Write data table
+    writer.writerow(data['table_headers'])
+    writer.writerows(data['table_data'])
+    
+    output.seek(0)
+    
+    return send_file(
+        output,
+        mimetype='text/csv',
+        as_attachment=True,
+        download_name=f'{report_type}_report_{datetime.now().strftime("%Y%m%d")}.csv'
+    )
@@ -0,0 +1,177 @@
+# WorkZen HRMS - team routes
+
+from flask import Blueprint, jsonify, request, session
+from datetime import datetime
+
+from ..database import db
+from ..models import Attendance, Leave, Payslip, User, UserHierarchy
+from ..accounts import login_required, role_required
+from ..caches import approver_pool
+from ..hierarchy import set_manager
+
+bp = Blueprint('team', __name__)
+
+def team_root(user):
+    """Manager whose organisation a team endpoint reports on, or None if not allowed.
+
+    Defaults to the current user; HR and Admin may pass any manager_id, others
+    only themselves or someone below them.
+    """
+    manager_id = request.args.get('manager_id', type=int) or user.id
+    if manager_id == user.id or user.role in ['ADMIN', 'HR_OFFICER']:
+        return manager_id
+    if db.session.query(UserHierarchy.query.filter_by(ancestor_id=user.id, descendant_id=manager_id).exists()).scalar():
+        return manager_id
+    return None
+
+@bp.route('/api/employees/<int:user_id>/manager', methods=['PUT'])
+@login_required
+@role_required('ADMIN', 'HR_OFFICER')
+def change_manager(user_id):
+    """Set or clear an employee's manager (Admin or HR Officer)"""
+    if not User.query.get(user_id):
+        return jsonify({'error': 'Employee not found'}), 404
+
+    data = request.get_json() or {}
+    manager_id = data.get('manager_id') or None
+    if manager_id is not None and not User.query.get(manager_id):
+        return jsonify({'error': 'Manager not found'}), 404
+
+    try:
+        set_manager(user_id, manager_id)
+        db.session.commit()
+        approver_pool.invalidate()
+        return jsonify({'message': 'Manager updated successfully'}), 200
+
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/team/attendance')
+@login_required
+def team_attendance():
+    """Attendance on one day (default today) for everyone under a manager"""
+    user = User.query.get(session.get('user_id'))
+    manager_id = team_root(user)
+    if manager_id is None:
+        return jsonify({'error': 'Unauthorized'}), 403
+    try:
+        day = datetime.strptime(request.args['date'], '%Y-%m-%d').date() if request.args.get('date') \
+            else datetime.now().date()
+    except ValueError:
+        return jsonify({'error': 'date must be YYYY-MM-DD'}), 400
+
+    rows = db.session.execute(
+        db.select(
+            User.id, User.full_name, UserHierarchy.depth,
+            Attendance.status, Attendance.check_in, Attendance.check_out, Attendance.working_hours
+        ).select_from(UserHierarchy).join(User, User.id == UserHierarchy.descendant_id).outerjoin(
+            Attendance, db.and_(Attendance.user_id == User.id, Attendance.attendance_date == day)
+        ).where(
+            UserHierarchy.ancestor_id == manager_id,
+            UserHierarchy.depth > 0,
+            User.is_active.is_(True)
+        ).order_by(UserHierarchy.depth, User.full_name)
+    ).all()
+
+    summary = {}
+    for row in rows:
+        status = row.status or 'Not Marked'
+        summary[status] = summary.get(status, 0) + 1
+
+    return jsonify({
+        'date': day.isoformat(),
+        'manager_id': manager_id,
+        'summary': summary,
+        'members': [
+            {
+                'id': row.id,
+                'name': row.full_name,
+                'depth': row.depth,
+                'status': row.status or 'Not Marked',
+                'check_in': row.check_in.strftime('%H:%M') if row.check_in else None,
+                'check_out': row.check_out.strftime('%H:%M') if row.check_out else None,
+                'working_hours': row.working_hours
+            }
+            for row in rows
+        ]
+    }), 200
+
+@bp.route('/api/team/leaves/pending')
+@login_required
+def team_pending_leaves():
+    """Pending leave requests from everyone under a manager"""
+    user = User.query.get(session.get('user_id'))
+    manager_id = team_root(user)
+    if manager_id is None:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    rows = db.session.execute(
+        db.select(Leave, User.full_name).join(User, User.id == Leave.user_id).join(
+            UserHierarchy, UserHierarchy.descendant_id == Leave.user_id
+        ).where(
+            UserHierarchy.ancestor_id == manager_id,
+            UserHierarchy.depth > 0,
+            Leave.status == 'Pending'
+        ).order_by(Leave.created_at)
+    ).all()
+
+    return jsonify({
+        'manager_id': manager_id,
+        'leaves': [
+            {
+                'id': leave.id,
+                'employee_id': leave.user_id,
+                'employee_name': name,
+                'leave_type': leave.leave_type,
+                'start_date': leave.start_date.isoformat(),
+                'end_date': leave.end_date.isoformat(),
+                'number_of_days': leave.number_of_days,
+                'approved_by': leave.approved_by,
+                'version': leave.version
+            }
+            for leave, name in rows
+        ]
+    }), 200
+
+@bp.route('/api/team/payroll')
+@login_required
+def team_payroll():
+    """Payslip totals for a month (default current) across everyone under a manager"""
+    user = User.query.get(session.get('user_id'))
+    manager_id = team_root(user)
+    if manager_id is None:
+        return jsonify({'error': 'Unauthorized'}), 403
+    try:
+        month = request.args.get('month') or datetime.now().strftime('%Y-%m')
+        payroll_month = datetime.strptime(month + '-01', '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({'error': 'month must be YYYY-MM'}), 400
+
+    totals = db.session.execute(
+        db.select(
+            db.func.count(Payslip.id),
+            db.func.coalesce(db.func.sum(Payslip.gross_earnings), 0),
+            db.func.coalesce(db.func.sum(
+                db.func.coalesce(Payslip.pf, 0) + db.func.coalesce(Payslip.income_tax, 0) +
+                db.func.coalesce(Payslip.professional_tax, 0)
+            ), 0),
+            db.func.coalesce(db.func.sum(Payslip.net_salary), 0)
+        ).join(UserHierarchy, UserHierarchy.descendant_id == Payslip.user_id).where(
+            UserHierarchy.ancestor_id == manager_id,
+            UserHierarchy.depth > 0,
+            Payslip.payroll_month == payroll_month
+        )
+    ).one()
+
+    return jsonify({
+        'manager_id': manager_id,
+        'month': payroll_month.strftime('%Y-%m'),
+        'payslips': totals[0],
+        'gross_earnings': round(totals[1], 2),
+        'total_deductions': round(totals[2], 2),
+        'net_salary': round(totals[3], 2)
+    }), 200
@@ -0,0 +1,377 @@
+# WorkZen HRMS - in-process caches for calendar, policies, approvers and departments
+
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from collections import OrderedDict, namedtuple
+from datetime import date, datetime, timedelta
+import threading
+import time
+
+from .config import settings
+from .database import db
+from .models import Department, Holiday, Leave, LeavePolicy, User
+
+class CompanyCalendar:
+    """Working-day calendar built from the weekday rules and the holidays table.
+
+    Each year is precomputed once into a prefix-sum array, so counting the
+    working days in a date range is a couple of lookups instead of a loop.
+    Holiday edits call invalidate(); the TTL bounds how long other workers
+    keep counting with the old holiday list.
+    """
+
+    def __init__(self, working_weekdays, ttl):
+        self.working_weekdays = frozenset(working_weekdays)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._years = {}
+
+    def _prefix(self, year):
+        """Cumulative working-day counts for a year, indexed by day of year"""
+        with self._lock:
+            loaded_at, prefix = self._years.get(year, (None, None))
+            if loaded_at is not None and time.monotonic() - loaded_at <= self.ttl:
+                return prefix
+            holidays = {
+                row.holiday_date for row in db.session.query(Holiday.holiday_date).filter(
+                    Holiday.holiday_date >= date(year, 1, 1),
+                    Holiday.holiday_date <= date(year, 12, 31)
+                )
+            }
+            prefix = [0]
+            current = date(year, 1, 1)
+            while current.year == year:
+                is_working = current.weekday() in self.working_weekdays and current not in holidays
+                prefix.append(prefix[-1] + int(is_working))
+                current += timedelta(days=1)
+            self._years[year] = (time.monotonic(), prefix)
+            return prefix
+
+    def working_days(self, start_date, end_date):
+        """Count working days between start_date and end_date (inclusive)"""
+        total = 0
+        for year in range(start_date.year, end_date.year + 1):
+            prefix = self._prefix(year)
+            first = start_date.timetuple().tm_yday if year == start_date.year else 1
+            last = end_date.timetuple().tm_yday if year == end_date.year else len(prefix) - 1
+            total += prefix[last] - prefix[first - 1]
+        return max(total, 0)
+
+    def invalidate(self, year=None):
+        """Drop cached years after the holidays table changes"""
+        with self._lock:
+            if year is None:
+                self._years.clear()
+            else:
+                self._years.pop(year, None)
+
+company_calendar = CompanyCalendar(settings['WORKING_WEEKDAYS'], settings['CALENDAR_TTL'])
+
+class ApproverPool:
+    """In-memory routing table for leave approvals.
+
+    Holds the manager chain, the active HR officers and the number of open
+    (Pending) requests per approver. Counts are kept up to date incrementally
+    on assign/resolve, so routing a new request costs no queries. The pool is
+    reloaded lazily after invalidate() (role or manager changes) or once the
+    TTL expires.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._managers = {}
+        self._approvers = {}
+        self._hr_officers = set()
+        self._pending = {}
+
+    def _load(self):
+        managers = dict(
+            db.session.query(User.id, User.manager_id).filter(User.manager_id.isnot(None)).all()
+        )
+        manager_ids = set(managers.values())
+        approvers = db.session.query(User.id, User.full_name, User.role).filter(
+            User.is_active.is_(True),
+            db.or_(User.role == 'HR_OFFICER', User.id.in_(manager_ids))
+        ).all()
+        pending = dict(
+            db.session.query(Leave.approved_by, db.func.count(Leave.id)).filter(
+                Leave.status == 'Pending',
+                Leave.approved_by.isnot(None)
+            ).group_by(Leave.approved_by).all()
+        )
+
+        self._managers = managers
+        self._approvers = {a.id: a.full_name for a in approvers}
+        self._hr_officers = {a.id for a in approvers if a.role == 'HR_OFFICER'}
+        self._pending = pending
+        self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            self._load()
+
+    def route(self, user_id):
+        """Pick an approver for user_id: nearest active manager, else least-loaded HR officer.
+
+        Returns (approver_id, approver_name), or (None, None) if nobody is available.
+        """
+        with self._lock:
+            self._ensure_loaded()
+
+            seen = {user_id}
+            manager_id = self._managers.get(user_id)
+            while manager_id is not None and manager_id not in seen:
+                if manager_id in self._approvers:
+                    return manager_id, self._approvers[manager_id]
+                seen.add(manager_id)
+                manager_id = self._managers.get(manager_id)
+
+            candidates = self._hr_officers - {user_id}
+            if not candidates:
+                return None, None
+            approver_id = min(candidates, key=lambda hr_id: (self._pending.get(hr_id, 0), hr_id))
+            return approver_id, self._approvers[approver_id]
+
+    def assigned(self, approver_id):
+        """Record a new open request for approver_id"""
+        if approver_id is not None:
+            with self._lock:
+                self._pending[approver_id] = self._pending.get(approver_id, 0) + 1
+
+    def resolved(self, approver_id):
+        """Record that an open request for approver_id was approved or rejected"""
+        if approver_id is not None:
+            with self._lock:
+                self._pending[approver_id] = max(self._pending.get(approver_id, 0) - 1, 0)
+
+    def preload(self):
+        """Load now instead of on the first routed request"""
+        with self._lock:
+            self._ensure_loaded()
+
+    def invalidate(self):
+        """Force a reload on next use (call after role or manager changes)"""
+        with self._lock:
+            self._loaded_at = None
+
+approver_pool = ApproverPool(settings['APPROVER_POOL_TTL'])
+
+# A leave policy compiled for fast evaluation (eligibility sets are None when unrestricted).
+# opening_days is what a new balance starts with: 0 for accruing types, the entitlement otherwise.
+CompiledLeavePolicy = namedtuple('CompiledLeavePolicy', [
+    'leave_type', 'annual_entitlement', 'accrual_rate', 'opening_days', 'carry_forward_cap',
+    'employment_types', 'contract_types'
+])
+
+class LeavePolicyEngine:
+    """Active leave policies compiled from the leave_policies table.
+
+    Loaded once and shared across requests; edits call invalidate(), and the
+    TTL bounds how long other workers keep an old copy. eligible() evaluates a
+    single employee in memory, while relation()/eligible_clause() let set-based
+    statements evaluate every employee against every policy in one pass.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._policies = {}
+
+    def _compile(self, policy):
+        return CompiledLeavePolicy(
+            leave_type=policy.leave_type,
+            annual_entitlement=policy.annual_entitlement,
+            accrual_rate=policy.accrual_rate,
+            opening_days=0 if policy.accrual_rate else policy.annual_entitlement,
+            carry_forward_cap=policy.carry_forward_cap or 0,
+            employment_types=frozenset(policy.employment_types) if policy.employment_types else None,
+            contract_types=frozenset(policy.contract_types) if policy.contract_types else None
+        )
+
+    def policies(self):
+        """Active policies keyed by leave type"""
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+                self._policies = {
+                    policy.leave_type: self._compile(policy)
+                    for policy in LeavePolicy.query.filter_by(is_active=True).order_by(LeavePolicy.id)
+                }
+                self._loaded_at = time.monotonic()
+            return self._policies
+
+    def get(self, leave_type):
+        return self.policies().get(leave_type)
+
+    @staticmethod
+    def eligible(policy, employment_type, contract_type):
+        """Whether an employee with these attributes is covered by policy"""
+        return (
+            (policy.employment_types is None or employment_type in policy.employment_types) and
+            (policy.contract_types is None or contract_type in policy.contract_types)
+        )
+
+    def eligible_policies(self, employment_type, contract_type):
+        return [
+            policy for policy in self.policies().values()
+            if self.eligible(policy, employment_type, contract_type)
+        ]
+
+    def relation(self):
+        """The active policies as a VALUES relation for INSERT ... SELECT statements"""
+        return db.values(
+            db.column('leave_type', db.String),
+            db.column('opening_days', db.Integer),
+            db.column('carry_forward_cap', db.Integer),
+            db.column('employment_types', ARRAY(db.String)),
+            db.column('contract_types', ARRAY(db.String)),
+            name='policies'
+        ).data([
+            (
+                policy.leave_type,
+                policy.opening_days,
+                policy.carry_forward_cap,
+                # Cast every cell: a column of bare NULLs would otherwise be typed text, breaking ANY()
+                db.cast(sorted(policy.employment_types) if policy.employment_types is not None else None,
+                        ARRAY(db.String)),
+                db.cast(sorted(policy.contract_types) if policy.contract_types is not None else None,
+                        ARRAY(db.String))
+            )
+            for policy in self.policies().values()
+        ])
+
+    @staticmethod
+    def user_clause(policy):
+        """SQL equivalent of eligible() for a single policy, evaluated against users"""
+        clauses = []
+        if policy.employment_types is not None:
+            clauses.append(User.employment_type.in_(policy.employment_types))
+        if policy.contract_types is not None:
+            clauses.append(User.contract_type.in_(policy.contract_types))
+        return db.and_(db.true(), *clauses)
+
+    @staticmethod
+    def eligible_clause(policies):
+        """SQL equivalent of eligible() for users joined to relation()"""
+        return db.and_(
+            db.or_(policies.c.employment_types.is_(None),
+                   User.employment_type == db.func.any(policies.c.employment_types)),
+            db.or_(policies.c.contract_types.is_(None),
+                   User.contract_type == db.func.any(policies.c.contract_types))
+        )
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+leave_policies = LeavePolicyEngine(settings['LEAVE_POLICY_TTL'])
+
+class AvailabilityCache:
+    """Bounded LRU of availability matrices for closed (fully past) date ranges.
+
+    Past ranges only change when a leave is requested or decided for past
+    dates or a holiday is edited; those paths call invalidate(). The TTL
+    bounds how long other workers serve a matrix from before such a change.
+    """
+
+    def __init__(self, ttl, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            stored_at, value = self._entries.get(key, (None, None))
+            if stored_at is None:
+                return None
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+availability_cache = AvailabilityCache(settings['AVAILABILITY_CACHE_TTL'])
+
+class DepartmentDirectory:
+    """Cached department list for dropdowns and id/name lookups.
+
+    The table is tiny and read by most list pages, so it is loaded once and
+    reloaded after local changes or when the TTL expires.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._all = []
+        self._by_id = {}
+        self._by_name = {}
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+                self._all = db.session.execute(
+                    db.select(Department.id, Department.name).order_by(Department.name)
+                ).all()
+                self._by_id = {row.id: row.name for row in self._all}
+                self._by_name = {row.name: row.id for row in self._all}
+                self._loaded_at = time.monotonic()
+
+    def all(self):
+        """(id, name) rows sorted by name"""
+        self._ensure_loaded()
+        return self._all
+
+    def name(self, department_id):
+        self._ensure_loaded()
+        return self._by_id.get(department_id)
+
+    def id_for(self, name):
+        self._ensure_loaded()
+        return self._by_name.get(name)
+
+    def resolve(self, name):
+        """Id of the named department, creating it if it does not exist yet"""
+        name = (name or '').strip()
+        if not name:
+            return None
+        department_id = self.id_for(name)
+        if department_id is None:
+            db.session.execute(
+                pg_insert(Department).values(name=name, created_at=datetime.utcnow())
+                .on_conflict_do_nothing(index_elements=['name'])
+            )
+            department_id = db.session.scalar(db.select(Department.id).where(Department.name == name))
+            self.invalidate()
+        return department_id
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+departments = DepartmentDirectory(settings['DEPARTMENT_CACHE_TTL'])
+
+def department_id_arg(value):
+    """Department filter from a request value: an id, or a name for older links.
+
+    Returns None for no filter and 0 (matches nothing) for an unknown name.
+    """
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return departments.id_for(value) or 0
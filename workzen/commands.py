@@ -0,0 +1,263 @@
+# WorkZen HRMS - flask CLI commands
+
+from flask import current_app
+from flask.cli import ScriptInfo, with_appcontext
+from datetime import datetime, timedelta
+import click
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from .config import ROOT_PATH, settings
+from .database import db
+from .models import Attendance, Badge, Leave, Payslip, SalaryAdjustment, SchemaMigration, User
+from .hierarchy import rebuild_user_hierarchy
+from .services import accrue_leave, rollover_leave_balances
+from .schema import MIGRATIONS, PERFORMANCE_INDEXES, init_db
+from .synthetic import generate_dataset
+from .server import open_pool_connections, warm_up
+
+@click.command('rollover-leave-balances')
+@with_appcontext
+@click.option('--year', type=int, default=None, help='Year to open (defaults to next year)')
+def rollover_leave_balances_command(year):
+    """Open a year's leave balances, carrying forward unused days"""
+    year = year or datetime.now().year + 1
+    written = rollover_leave_balances(year)
+    db.session.commit()
+    for leave_type, count in written.items():
+        print(f"✅ {leave_type}: {count} balances written for {year}")
+
+@click.command('rebuild-user-hierarchy')
+@with_appcontext
+def rebuild_user_hierarchy_command():
+    """Recompute the manager closure table from users.manager_id"""
+    count = rebuild_user_hierarchy()
+    db.session.commit()
+    print(f"✅ {count} hierarchy links written")
+
+@click.command('accrue-leave')
+@with_appcontext
+@click.option('--month', default=None, help='Month to accrue as YYYY-MM (defaults to the current month)')
+def accrue_leave_command(month):
+    """Credit a month of leave accrual for every accruing leave type"""
+    period = datetime.strptime(month, '%Y-%m').date() if month else datetime.now().date()
+    credited = accrue_leave(period)
+    db.session.commit()
+    for leave_type, count in credited.items():
+        print(f"✅ {leave_type}: {count} employees credited for {period:%Y-%m}")
+
+@click.command('migrate-db')
+@with_appcontext
+def migrate_db_command():
+    """Create missing tables and apply pending schema migrations"""
+    init_db()
+
+@click.command('migration-status')
+@with_appcontext
+def migration_status_command():
+    """List schema migrations and whether each has been applied"""
+    applied = {m.version: m.applied_at for m in SchemaMigration.query.all()}
+    for migration in MIGRATIONS:
+        status = f"applied {applied[migration.version]:%Y-%m-%d %H:%M}" if migration.version in applied else 'pending'
+        print(f"{migration.version:>3}  {migration.description:<50} {status}")
+
+def hot_queries(user_id, today):
+    """Representative forms of the busiest page and report queries, for EXPLAIN"""
+    month = today.replace(day=1)
+    per_page = current_app.config['LEAVES_PER_PAGE']
+    return [
+        ('Own leaves (time off)', db.select(Leave).where(Leave.user_id == user_id)
+            .order_by(Leave.created_at.desc())),
+        ('Leaves by status (time off)', db.select(Leave).where(Leave.status == 'Approved')
+            .order_by(Leave.created_at.desc()).limit(per_page)),
+        ('Pending queue, HR (time off)', db.select(Leave).where(Leave.status == 'Pending')
+            .order_by(Leave.created_at.desc()).limit(per_page)),
+        ('Pending queue, approver (time off)', db.select(Leave).where(
+            Leave.status == 'Pending', Leave.approved_by == user_id
+        ).order_by(Leave.created_at.desc()).limit(per_page)),
+        ('Pending count (dashboard)', db.select(db.func.count(Leave.id)).where(Leave.status == 'Pending')),
+        ('Draft payslips this month (payroll)', db.select(db.func.count(Payslip.id)).where(
+            Payslip.payroll_month == month, Payslip.status == 'Draft'
+        )),
+        ('Present today (dashboard)', db.select(db.func.count(Attendance.id)).where(
+            Attendance.attendance_date == today, Attendance.status == 'Present'
+        )),
+        ('Attendance for 30 days (reports)', db.select(Attendance).where(
+            Attendance.attendance_date >= today - timedelta(days=30), Attendance.attendance_date <= today
+        )),
+        ('Recent salary adjustments (payroll)', db.select(SalaryAdjustment).where(
+            SalaryAdjustment.user_id == user_id
+        ).order_by(SalaryAdjustment.adjustment_date.desc()).limit(5)),
+        ('Badges (profile)', db.select(Badge).where(Badge.user_id == user_id)),
+    ]
+
+def explain(statement, analyze=False):
+    """EXPLAIN plan for a SQLAlchemy statement as a list of lines"""
+    connection = db.session.connection()
+    # Inline the values, as psycopg2 does client-side, so the plan matches what the server sees
+    sql = statement.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True})
+    prefix = 'EXPLAIN (ANALYZE, BUFFERS)' if analyze else 'EXPLAIN'
+    return [row[0] for row in connection.exec_driver_sql(f"{prefix} {sql}")]
+
+@click.command('explain-hot-queries')
+@with_appcontext
+@click.option('--user', 'login_id', default=None, help='Login ID used for per-user queries (defaults to the first employee)')
+@click.option('--compare', is_flag=True,
+              help='Show plans without and with PERFORMANCE_INDEXES (drops/creates them in a rolled-back '
+                   'transaction, which locks the tables; use a staging copy)')
+@click.option('--analyze', is_flag=True, help='Run the queries (EXPLAIN ANALYZE) for actual timings')
+def explain_hot_queries_command(login_id, compare, analyze):
+    """Print EXPLAIN plans for the hot queries the performance indexes target"""
+    user = User.query.filter_by(login_id=login_id).first() if login_id else User.query.order_by(User.id).first()
+    if user is None:
+        raise click.ClickException('No such user')
+    queries = hot_queries(user.id, datetime.now().date())
+    try:
+        if compare:
+            for name in PERFORMANCE_INDEXES:
+                db.session.execute(db.text(f"DROP INDEX IF EXISTS {name}"))
+            before = {name: explain(statement, analyze) for name, statement in queries}
+            for name, definition in PERFORMANCE_INDEXES.items():
+                db.session.execute(db.text(f"CREATE INDEX {name} ON {definition}"))
+        for name, statement in queries:
+            print(f"=== {name}")
+            if compare:
+                print('--- before')
+                print('\n'.join(before[name]))
+                print('--- after')
+            print('\n'.join(explain(statement, analyze)))
+            print()
+    finally:
+        db.session.rollback()
+
+# Run in a fresh interpreter by benchmark-startup: argv is an optional login id and
+# the paths to request; prints the timings as JSON
+STARTUP_PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+from workzen import create_app
+from workzen.models import User
+timings = {'import': time.perf_counter() - started}
+started = time.perf_counter()
+app = create_app()
+timings['create_app'] = time.perf_counter() - started
+client = app.test_client()
+if sys.argv[1]:
+    with app.app_context():
+        user = User.query.filter_by(login_id=sys.argv[1]).one()
+    with client.session_transaction() as session:
+        session['user_id'] = user.id
+for path in sys.argv[2:]:
+    started = time.perf_counter()
+    status = client.get(path).status_code
+    first = time.perf_counter() - started
+    started = time.perf_counter()
+    client.get(path)
+    timings[path] = {'status': status, 'first': first, 'second': time.perf_counter() - started}
+timings['max_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps(timings))
+"""
+
+@click.command('benchmark-startup')
+@click.option('--runs', default=5, show_default=True, help='Fresh interpreters to start')
+@click.option('--user', 'login_id', default='', help='Login ID to request the paths as (default: anonymous)')
+@click.argument('paths', nargs=-1)
+def benchmark_startup_command(runs, login_id, paths):
+    """Time cold import, create_app() and first-request latency in fresh interpreters (default path: /login)"""
+    paths = paths or ('/login',)
+    results = []
+    for _ in range(runs):
+        probe = subprocess.run(
+            [sys.executable, '-c', STARTUP_PROBE, login_id, *paths],
+            cwd=ROOT_PATH, capture_output=True, text=True
+        )
+        if probe.returncode != 0:
+            raise click.ClickException(probe.stderr.strip().splitlines()[-1])
+        results.append(json.loads(probe.stdout.strip().splitlines()[-1]))
+
+    def report(label, values):
+        values = [value * 1000 for value in values]
+        print(f"{label:<40} median {statistics.median(values):8.1f} ms   min {min(values):8.1f} ms")
+
+    report('cold import', [r['import'] for r in results])
+    report('create_app()', [r['create_app'] for r in results])
+    for path in paths:
+        statuses = sorted({r[path]['status'] for r in results})
+        report(f"{path} first request {statuses}", [r[path]['first'] for r in results])
+        report(f"{path} second request", [r[path]['second'] for r in results])
+    print(f"{'peak RSS':<40} median {statistics.median(r['max_rss_mb'] for r in results):8.1f} MB")
+
+@click.command('generate-dataset')
+@with_appcontext
+@click.option('--users', 'user_count', default=1000, show_default=True, help='Employees to create')
+@click.option('--years', default=3, show_default=True, help='Calendar years of history, ending with --end-date')
+@click.option('--seed', default=42, show_default=True, help='Random seed; the same seed and end date give the same data')
+@click.option('--end-date', default=None, help='Last day of history as YYYY-MM-DD (defaults to today)')
+@click.option('--password', default='WorkZen@123', show_default=True, help='Password for every generated user')
+def generate_dataset_command(user_count, years, seed, end_date, password):
+    """Load a synthetic organisation for staging and benchmarks"""
+    init_db()
+    if User.query.filter(User.login_id.like('SYN%')).first():
+        raise click.ClickException('Synthetic users already exist; use a fresh database')
+    end_date = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else datetime.now().date()
+    started = time.perf_counter()
+    counts = generate_dataset(user_count, years, seed, end_date, password)
+    db.session.commit()
+    for table, count in counts.items():
+        print(f"✅ {table}: {count} rows")
+    print(f"Loaded in {time.perf_counter() - started:.1f}s; sign in as SYN000001 (admin) with password {password}")
+
+@click.command('serve')
+@click.option('--bind', default=lambda: settings['SERVE_BIND'], help='host:port or unix:/path (SERVE_BIND)')
+@click.option('--workers', type=int, default=lambda: settings['SERVE_WORKERS'], help='Worker processes (SERVE_WORKERS)')
+@click.option('--threads', type=int, default=lambda: settings['SERVE_THREADS'], help='Threads per worker (SERVE_THREADS)')
+@click.option('--max-requests', type=int, default=lambda: settings['SERVE_MAX_REQUESTS'],
+              help='Recycle a worker after this many requests, 0 = never (SERVE_MAX_REQUESTS)')
+def serve_command(bind, workers, threads, max_requests):
+    """Run the production server: gunicorn with the app preloaded and warmed before forking.
+
+    kill -HUP <master> restarts the workers gracefully (same code, fresh caches and
+    connections); to deploy new code send USR2, then QUIT to the old master once the
+    new one is up, or restart the service.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise click.ClickException('The serve command needs gunicorn: pip install -r requirements.txt')
+
+    app = click.get_current_context().ensure_object(ScriptInfo).load_app()
+
+    options = {
+        'bind': bind,
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread' if threads > 1 else 'sync',
+        'preload_app': True,
+        'max_requests': max_requests,
+        # Stagger recycling so workers do not all restart at once
+        'max_requests_jitter': max_requests // 10,
+        'timeout': app.config['SERVE_TIMEOUT'],
+        'graceful_timeout': app.config['SERVE_GRACEFUL_TIMEOUT'],
+        'post_worker_init': lambda worker: open_pool_connections(app),
+    }
+
+    class WorkZenServer(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            warm_up(app)
+            return app
+
+    WorkZenServer().run()
+
+def register_commands(app):
+    """Add the WorkZen commands to `flask`"""
+    for command in (rollover_leave_balances_command, rebuild_user_hierarchy_command, accrue_leave_command,
+                    migrate_db_command, migration_status_command, explain_hot_queries_command,
+                    benchmark_startup_command, generate_dataset_command, serve_command):
+        app.cli.add_command(command)
@@ -0,0 +1,119 @@
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+# Repository root: templates/, static/ and logs/ live here
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# PostgreSQL Configuration
+def database_uri(host, port):
+    return (
+        f"postgresql://{os.environ.get('DB_USER', 'postgres')}:"
+        f"{os.environ.get('DB_PASSWORD', '8511')}@"
+        f"{host}:"
+        f"{port}/"
+        f"{os.environ.get('DB_NAME', 'workzen_db')}"
+    )
+
+def env_flag(name, default=False):
+    """Boolean environment variable ('1', 'true', 'yes', 'on')"""
+    value = os.environ.get(name)
+    return default if value is None else value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+# Settings read from the environment; create_app() loads them into app.config
+settings = {}
+settings['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'workzen-secret-key-2025')
+
+settings['SQLALCHEMY_DATABASE_URI'] = database_uri(
+    os.environ.get('DB_HOST', 'localhost'), os.environ.get('DB_PORT', 5432)
+)
+settings['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+# Optional read replica for read-only views (same user and database name as the primary).
+# After a write, that user's reads stay on the primary for DB_REPLICA_STICKY_SECONDS.
+settings['SQLALCHEMY_BINDS'] = {}
+if os.environ.get('DB_REPLICA_HOST'):
+    settings['SQLALCHEMY_BINDS']['replica'] = database_uri(
+        os.environ['DB_REPLICA_HOST'], os.environ.get('DB_REPLICA_PORT', os.environ.get('DB_PORT', 5432))
+    )
+settings['DB_REPLICA_STICKY_SECONDS'] = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 10))
+
+# Connection pool. DB_PGBOUNCER=true is for PgBouncer in transaction pooling mode: no
+# startup options or session state, so statement_timeout is applied per transaction.
+settings['DB_PGBOUNCER'] = env_flag('DB_PGBOUNCER')
+settings['DB_STATEMENT_TIMEOUT'] = int(os.environ.get('DB_STATEMENT_TIMEOUT', 0))  # ms, 0 = no limit
+settings['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+    'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+    'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    'pool_pre_ping': env_flag('DB_POOL_PRE_PING', True),
+    'connect_args': {'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 10))}
+}
+if settings['DB_STATEMENT_TIMEOUT'] and not settings['DB_PGBOUNCER']:
+    settings['SQLALCHEMY_ENGINE_OPTIONS']['connect_args']['options'] = (
+        f"-c statement_timeout={settings['DB_STATEMENT_TIMEOUT']}"
+    )
+
+# Reports and exports get their own small pool (on the replica when there is one) so a
+# burst of heavy reports cannot starve interactive requests of connections. Their
+# transactions are read-only and limited by DB_REPORTING_STATEMENT_TIMEOUT (ms).
+settings['DB_REPORTING_STATEMENT_TIMEOUT'] = int(os.environ.get('DB_REPORTING_STATEMENT_TIMEOUT', 60000))
+settings['SQLALCHEMY_BINDS']['reporting'] = {
+    'url': settings['SQLALCHEMY_BINDS'].get('replica', settings['SQLALCHEMY_DATABASE_URI']),
+    'pool_size': int(os.environ.get('DB_REPORTING_POOL_SIZE', 2)),
+    'max_overflow': int(os.environ.get('DB_REPORTING_MAX_OVERFLOW', 0)),
+    'pool_timeout': int(os.environ.get('DB_REPORTING_POOL_TIMEOUT', 5)),
+    'connect_args': {'connect_timeout': settings['SQLALCHEMY_ENGINE_OPTIONS']['connect_args']['connect_timeout']}
+}
+
+# Company calendar: weekdays that count as working days (Mon=0 ... Sun=6)
+settings['WORKING_WEEKDAYS'] = tuple(
+    int(day) for day in os.environ.get('WORKING_WEEKDAYS', '0,1,2,3,4,5').split(',')
+)
+
+# Seconds before a cached calendar year is rebuilt, so holiday edits made in another worker show up
+settings['CALENDAR_TTL'] = int(os.environ.get('CALENDAR_TTL', 300))
+
+# Seconds a cached availability matrix for a past range is served (local leave changes clear it immediately)
+settings['AVAILABILITY_CACHE_TTL'] = int(os.environ.get('AVAILABILITY_CACHE_TTL', 300))
+
+# Rows per page on the time-off leave lists
+settings['LEAVES_PER_PAGE'] = int(os.environ.get('LEAVES_PER_PAGE', 25))
+
+# Compiled leave policies are reloaded at least this often (edits reload immediately)
+settings['LEAVE_POLICY_TTL'] = int(os.environ.get('LEAVE_POLICY_TTL', 300))
+
+# Leave approver pool is rebuilt at least this often to correct drift between workers
+settings['APPROVER_POOL_TTL'] = int(os.environ.get('APPROVER_POOL_TTL', 300))
+
+# Employee cards per page in the directory
+settings['EMPLOYEES_PER_PAGE'] = int(os.environ.get('EMPLOYEES_PER_PAGE', 48))
+
+# Seconds before the cached department list is reloaded (local changes reload it immediately)
+settings['DEPARTMENT_CACHE_TTL'] = int(os.environ.get('DEPARTMENT_CACHE_TTL', 300))
+
+# /metrics: Prometheus scrapes send this as a bearer token (unset = signed-in admins only)
+settings['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
+
+# Log a possible N+1 when one request runs the same SQL statement more than this many times (0 = off)
+settings['N_PLUS_ONE_THRESHOLD'] = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 10))
+
+# Slow-query log: statements slower than SLOW_QUERY_MS are appended to SLOW_QUERY_LOG as
+# JSON lines, rotated at SLOW_QUERY_LOG_BYTES. A SLOW_QUERY_EXPLAIN_SAMPLE fraction (0-1)
+# of slow SELECTs is re-run under EXPLAIN (ANALYZE, BUFFERS) on the reporting pool.
+settings['SLOW_QUERY_MS'] = int(os.environ.get('SLOW_QUERY_MS', 500))  # 0 = off
+settings['SLOW_QUERY_LOG'] = os.environ.get('SLOW_QUERY_LOG', os.path.join(ROOT_PATH, 'logs', 'slow_queries.log'))
+settings['SLOW_QUERY_LOG_BYTES'] = int(os.environ.get('SLOW_QUERY_LOG_BYTES', 10_000_000))
+settings['SLOW_QUERY_LOG_BACKUPS'] = int(os.environ.get('SLOW_QUERY_LOG_BACKUPS', 5))
+settings['SLOW_QUERY_EXPLAIN_SAMPLE'] = float(os.environ.get('SLOW_QUERY_EXPLAIN_SAMPLE', 0))
+
+# `flask serve` (gunicorn). Each worker runs SERVE_THREADS threads, so keep that at or
+# below DB_POOL_SIZE; workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) must fit max_connections.
+settings['SERVE_BIND'] = os.environ.get('SERVE_BIND', '0.0.0.0:5000')
+settings['SERVE_WORKERS'] = int(os.environ.get('SERVE_WORKERS', os.cpu_count() or 2))
+settings['SERVE_THREADS'] = int(os.environ.get('SERVE_THREADS', 4))
+settings['SERVE_MAX_REQUESTS'] = int(os.environ.get('SERVE_MAX_REQUESTS', 5000))  # 0 = never recycle
+settings['SERVE_TIMEOUT'] = int(os.environ.get('SERVE_TIMEOUT', 60))
+settings['SERVE_GRACEFUL_TIMEOUT'] = int(os.environ.get('SERVE_GRACEFUL_TIMEOUT', 30))
@@ -0,0 +1,142 @@
+# WorkZen HRMS - database connection, pool instrumentation and read routing
+
+from flask import current_app, g, has_request_context, jsonify, session
+from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+from functools import wraps
+import threading
+import time
+
+from .config import settings
+
+class PoolMetrics:
+    """Counters for time spent waiting on the connection pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def record(self, seconds, timed_out=False):
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            self.timeouts += int(timed_out)
+
+    def snapshot(self, pool):
+        with self._lock:
+            return {
+                'pool_size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+                'checkouts': self.waits,
+                'avg_wait_ms': round(self.wait_seconds / self.waits * 1000, 3) if self.waits else 0.0,
+                'max_wait_ms': round(self.max_wait_seconds * 1000, 3),
+                'timeouts': self.timeouts
+            }
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+class RoutingSession(FlaskSQLAlchemySession):
+    """Session that sends reads from @reporting_queries views to the reporting
+    bind and reads from @replica_reads views to the replica bind.
+
+    Writes (flushes and INSERT/UPDATE/DELETE statements) always go to the
+    primary. Once a request writes, the rest of it reads from the primary
+    too, and after_request keeps that user on the primary for a few seconds
+    so they read their own writes despite replication lag.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            if self._flushing or isinstance(clause, UpdateBase):
+                g.db_wrote = True
+            elif g.get('reporting', False) and not g.get('db_wrote', False):
+                return db.engines['reporting']
+            elif reads_from_replica():
+                return db.engines['replica']
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+# Engine options are passed as defaults too so the replica and reporting binds share them
+db = SQLAlchemy(session_options={'class_': RoutingSession},
+                engine_options={'poolclass': InstrumentedQueuePool, **settings['SQLALCHEMY_ENGINE_OPTIONS']})
+
+def reads_from_replica():
+    """Whether reads in the current request may be served by the replica"""
+    return (
+        g.get('replica_reads', False) and
+        not g.get('db_wrote', False) and
+        'replica' in current_app.config.get('SQLALCHEMY_BINDS', {}) and
+        time.time() >= session.get('primary_reads_until', 0)
+    )
+
+def replica_reads(f):
+    """Decorator for read-only views whose queries may run on the read replica"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.replica_reads = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+def reporting_queries(f):
+    """Decorator for report and export views: their queries run on the reporting
+    pool, read-only and under DB_REPORTING_STATEMENT_TIMEOUT"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.reporting = True
+        try:
+            return f(*args, **kwargs)
+        except OperationalError as e:
+            if getattr(e.orig, 'pgcode', None) != '57014':  # query_canceled
+                raise
+            db.session.rollback()
+            return jsonify(error='Report took too long to run; narrow the date range or department'), 504
+        except PoolTimeoutError:
+            return jsonify(error='Too many reports are running; try again shortly'), 503
+    return decorated_function
+
+def stick_to_primary_after_write(response):
+    """Keep a user's reads on the primary for a while after they write"""
+    if g.get('db_wrote') and 'replica' in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        session['primary_reads_until'] = time.time() + current_app.config['DB_REPLICA_STICKY_SECONDS']
+    return response
+
+def transaction_settings(bind_key):
+    """Statements run at the start of every transaction on the given bind"""
+    if bind_key == 'reporting':
+        return [
+            'SET TRANSACTION READ ONLY',
+            f"SET LOCAL statement_timeout = {current_app.config['DB_REPORTING_STATEMENT_TIMEOUT']}"
+        ]
+    if current_app.config['DB_PGBOUNCER'] and current_app.config['DB_STATEMENT_TIMEOUT']:
+        return [f"SET LOCAL statement_timeout = {current_app.config['DB_STATEMENT_TIMEOUT']}"]
+    return []
+
+def apply_transaction_settings(engine, statements):
+    """SET LOCAL lasts for the transaction, so it is safe behind PgBouncer"""
+    @db.event.listens_for(engine, 'begin')
+    def set_transaction_settings(connection):
+        for statement in statements:
+            connection.exec_driver_sql(statement)
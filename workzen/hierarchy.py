@@ -0,0 +1,97 @@
+# WorkZen HRMS - manager hierarchy (closure table)
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .database import db
+from .models import User, UserHierarchy
+
+# Guard against manager cycles in legacy data when rebuilding the hierarchy
+MAX_HIERARCHY_DEPTH = 64
+
+def link_user_hierarchy(user_id, manager_id=None):
+    """Add a new user to the closure table under manager_id (call before commit)"""
+    db.session.execute(
+        pg_insert(UserHierarchy).values(ancestor_id=user_id, descendant_id=user_id, depth=0)
+        .on_conflict_do_nothing()
+    )
+    if manager_id:
+        db.session.execute(
+            pg_insert(UserHierarchy).from_select(
+                ['ancestor_id', 'descendant_id', 'depth'],
+                db.select(UserHierarchy.ancestor_id, db.literal(user_id), UserHierarchy.depth + 1)
+                .where(UserHierarchy.descendant_id == manager_id)
+            ).on_conflict_do_nothing()
+        )
+
+def set_manager(user_id, manager_id):
+    """Move user_id (and everyone under them) below manager_id; None detaches them.
+
+    Drops the links from the old ancestors to the subtree and adds the cross
+    product of the new manager's ancestors with the subtree, so the change
+    costs two statements however deep the tree is. Raises ValueError if the
+    move would create a cycle.
+    """
+    if manager_id is not None and (manager_id == user_id or db.session.query(
+        UserHierarchy.query.filter_by(ancestor_id=user_id, descendant_id=manager_id).exists()
+    ).scalar()):
+        raise ValueError('An employee cannot report to themselves or to someone in their own team')
+
+    subtree = db.select(UserHierarchy.descendant_id).where(UserHierarchy.ancestor_id == user_id)
+    old_ancestors = db.select(UserHierarchy.ancestor_id).where(
+        UserHierarchy.descendant_id == user_id,
+        UserHierarchy.ancestor_id != user_id
+    )
+    db.session.execute(
+        db.delete(UserHierarchy).where(
+            UserHierarchy.descendant_id.in_(subtree),
+            UserHierarchy.ancestor_id.in_(old_ancestors)
+        ),
+        execution_options={'synchronize_session': False}
+    )
+
+    if manager_id is not None:
+        above = db.aliased(UserHierarchy)
+        below = db.aliased(UserHierarchy)
+        db.session.execute(
+            pg_insert(UserHierarchy).from_select(
+                ['ancestor_id', 'descendant_id', 'depth'],
+                db.select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+                .join(below, db.true())
+                .where(above.descendant_id == manager_id, below.ancestor_id == user_id)
+            )
+        )
+
+    db.session.execute(
+        db.update(User).where(User.id == user_id).values(
+            manager_id=manager_id, profile_version=User.profile_version + 1
+        ),
+        execution_options={'synchronize_session': False}
+    )
+
+def rebuild_user_hierarchy():
+    """Recompute the whole closure table from users.manager_id"""
+    chain = db.select(
+        User.id.label('ancestor_id'), User.id.label('descendant_id'), db.literal(0).label('depth')
+    ).cte('chain', recursive=True)
+    manager = db.aliased(User)
+    chain = chain.union_all(
+        db.select(manager.manager_id, chain.c.descendant_id, chain.c.depth + 1)
+        .join(manager, manager.id == chain.c.ancestor_id)
+        .where(manager.manager_id.isnot(None), chain.c.depth < MAX_HIERARCHY_DEPTH)
+    )
+    db.session.execute(db.delete(UserHierarchy))
+    result = db.session.execute(
+        pg_insert(UserHierarchy).from_select(
+            ['ancestor_id', 'descendant_id', 'depth'],
+            db.select(chain.c.ancestor_id, chain.c.descendant_id, db.func.min(chain.c.depth))
+            .group_by(chain.c.ancestor_id, chain.c.descendant_id)
+        )
+    )
+    return result.rowcount
+
+def team_member_ids(manager_id):
+    """Everyone below manager_id at any depth, as a subquery on the closure table"""
+    return db.select(UserHierarchy.descendant_id).where(
+        UserHierarchy.ancestor_id == manager_id,
+        UserHierarchy.depth > 0
+    )
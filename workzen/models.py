@@ -0,0 +1,333 @@
+# WorkZen HRMS - database models
+
+from sqlalchemy.orm import Session as OrmSession
+from werkzeug.security import check_password_hash, generate_password_hash
+from datetime import datetime
+import enum
+
+from .database import db
+
+# Status and role columns are native Postgres enums: 4 bytes per row instead of a
+# VARCHAR, which keeps the big tables and their composite indexes small. Members
+# are str subclasses, so they compare equal to (and render as) the plain strings.
+class Role(enum.StrEnum):
+    ADMIN = 'ADMIN'
+    HR_OFFICER = 'HR_OFFICER'
+    PAYROLL_OFFICER = 'PAYROLL_OFFICER'
+    EMPLOYEE = 'EMPLOYEE'
+
+class AttendanceStatus(enum.StrEnum):
+    PRESENT = 'Present'
+    ABSENT = 'Absent'
+    LATE = 'Late'
+
+class LeaveStatus(enum.StrEnum):
+    PENDING = 'Pending'
+    APPROVED = 'Approved'
+    REJECTED = 'Rejected'
+
+class PayslipStatus(enum.StrEnum):
+    DRAFT = 'Draft'
+    PROCESSED = 'Processed'
+    PAID = 'Paid'
+
+def pg_enum(enum_class, name):
+    """Column type for a native Postgres enum whose labels are the members' values"""
+    return db.Enum(enum_class, name=name, values_callable=lambda members: [member.value for member in members])
+
+def enum_arg(enum_class, value):
+    """Enum member for a request value, or None when it is missing or not a member"""
+    try:
+        return enum_class(value)
+    except ValueError:
+        return None
+
+def enum_filter(column, enum_class, value):
+    """Filter for a request value on an enum column; unknown values match nothing"""
+    member = enum_arg(enum_class, value)
+    return column == member if member else db.false()
+
+class User(db.Model):
+    """User model for Admin, HR Officer, Payroll Officer, and Employees"""
+    __tablename__ = 'users'
+
+    id = db.Column(db.Integer, primary_key=True)
+    login_id = db.Column(db.String(50), unique=True, nullable=False)
+    email = db.Column(db.String(255), unique=True, nullable=False)
+    password = db.Column(db.String(255), nullable=False)
+    full_name = db.Column(db.String(255), nullable=False)
+    phone = db.Column(db.String(20))
+    role = db.Column(pg_enum(Role, 'user_role'), default=Role.EMPLOYEE)
+    department = db.Column(db.String(100))      # Department name, kept in step with department_id
+    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), index=True)
+    job_position = db.Column(db.String(100))
+    job_title = db.Column(db.String(100))
+    manager_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    employment_type = db.Column(db.String(50))  # Full-time, Part-time
+    contract_type = db.Column(db.String(50))    # Permanent, Contract
+    work_address = db.Column(db.String(255))
+    work_location = db.Column(db.String(100))
+    time_zone = db.Column(db.String(50))
+    wage_type = db.Column(db.String(50))        # Fixed Wage, Hourly
+    wage = db.Column(db.Float)                 # Monthly/Hourly wage
+    working_hours = db.Column(db.String(50))   # e.g., "40 hours/week"
+    shift_time = db.Column(db.String(100))     # e.g., "9:00 AM - 6:00 PM"
+    date_of_joining = db.Column(db.Date)
+    date_of_birth = db.Column(db.Date)
+    gender = db.Column(db.String(20))
+    nationality = db.Column(db.String(100))
+    emergency_contact_name = db.Column(db.String(255))
+    emergency_contact_relation = db.Column(db.String(100))
+    emergency_contact_phone = db.Column(db.String(20))
+    basic_salary = db.Column(db.Float)
+    is_active = db.Column(db.Boolean, default=True)
+    profile_version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # See bump_profile_versions
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    leaves = db.relationship('Leave', backref='employee', lazy=True, foreign_keys='[Leave.user_id]', cascade='save-update')
+    badges = db.relationship('Badge', lazy=True, foreign_keys='[Badge.user_id]')
+    certifications = db.relationship('Certification', lazy=True)
+
+    payslips = db.relationship('Payslip', backref='employee', lazy=True, cascade='save-update')
+    attendances = db.relationship('Attendance', backref='employee', lazy=True, cascade='save-update')
+    
+
+    def set_password(self, password):
+        """Hash password"""
+        self.password = generate_password_hash(password)
+
+    def check_password(self, password):
+        """Verify password"""
+        return check_password_hash(self.password, password)
+
+class Department(db.Model):
+    """Department referenced by users"""
+    __tablename__ = 'departments'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class UserHierarchy(db.Model):
+    """Closure table of the manager tree: one row per (ancestor, descendant) pair.
+
+    Every user has a depth-0 row to themselves; depth 1 is a direct report.
+    Maintained by link_user_hierarchy() and set_manager().
+    """
+    __tablename__ = 'user_hierarchy'
+
+    ancestor_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    descendant_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True, index=True)
+    depth = db.Column(db.Integer, nullable=False)
+
+class Attendance(db.Model):
+    """Attendance tracking model"""
+    __tablename__ = 'attendance'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    attendance_date = db.Column(db.Date, nullable=False)
+    check_in = db.Column(db.Time)
+    check_out = db.Column(db.Time)
+    status = db.Column(pg_enum(AttendanceStatus, 'attendance_status'))
+    working_hours = db.Column(db.Float)
+    remarks = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (db.UniqueConstraint('user_id', 'attendance_date', name='uq_user_date'),)
+
+class Leave(db.Model):
+    """Leave request model"""
+    __tablename__ = 'leaves'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # User who requested leave
+    requester = db.relationship('User', foreign_keys=[user_id])
+
+    leave_type = db.Column(db.String(50), nullable=False)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    reason = db.Column(db.Text)
+    status = db.Column(pg_enum(LeaveStatus, 'leave_status'), default=LeaveStatus.PENDING)
+    approved_by = db.Column(db.Integer, db.ForeignKey('users.id'))
+    approver = db.relationship('User', foreign_keys=[approved_by])
+    number_of_days = db.Column(db.Integer)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # Bumped on every status change
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Statuses that hold the dates; covered by the ex_leaves_user_active_overlap constraint
+    ACTIVE_STATUSES = (LeaveStatus.PENDING, LeaveStatus.APPROVED)
+
+    @classmethod
+    def overlapping(cls, start_date, end_date):
+        """Active leaves intersecting [start_date, end_date], written to match the GiST exclusion index"""
+        return db.and_(
+            cls.status.in_(cls.ACTIVE_STATUSES),
+            db.func.daterange(cls.start_date, cls.end_date, db.literal_column("'[]'")).op('&&')(
+                db.func.daterange(start_date, end_date, db.literal_column("'[]'"))
+            )
+        )
+
+class LeaveBalance(db.Model):
+    """Leave balance tracking"""
+    __tablename__ = 'leave_balance'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    leave_type = db.Column(db.String(50), nullable=False)
+    total_days = db.Column(db.Integer)
+    used_days = db.Column(db.Integer, default=0)
+    remaining_days = db.Column(db.Integer)
+    carried_forward = db.Column(db.Integer, default=0, server_default='0')  # Included in total_days
+    year = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (db.UniqueConstraint('user_id', 'leave_type', 'year', name='uq_user_leave_year'),)
+
+class Payslip(db.Model):
+    """Payslip model"""
+    __tablename__ = 'payslips'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    payroll_month = db.Column(db.Date, nullable=False)
+    basic_salary = db.Column(db.Float)
+    hra = db.Column(db.Float)  # House Rent Allowance
+    da = db.Column(db.Float)   # Dearness Allowance
+    gross_earnings = db.Column(db.Float)
+    pf = db.Column(db.Float)   # Provident Fund
+    income_tax = db.Column(db.Float)
+    professional_tax = db.Column(db.Float)
+    net_salary = db.Column(db.Float)
+    status = db.Column(pg_enum(PayslipStatus, 'payslip_status'), default=PayslipStatus.DRAFT)
+    processed_date = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (db.UniqueConstraint('user_id', 'payroll_month', name='uq_user_month'),)
+
+class SalaryAdjustment(db.Model):
+    """Salary adjustment history"""
+    __tablename__ = 'salary_adjustments'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    adjustment_date = db.Column(db.Date, nullable=False)
+    old_salary = db.Column(db.Float)
+    new_salary = db.Column(db.Float)
+    reason = db.Column(db.Text)
+    approved_by = db.Column(db.Integer, db.ForeignKey('users.id'))
+    
+    # FIX: Add backref=False or custom backref names
+    employee = db.relationship('User', foreign_keys=[user_id], backref=db.backref(
+        'adjusted_salaries', order_by='SalaryAdjustment.adjustment_date.desc()'
+    ))
+    approver = db.relationship('User', foreign_keys=[approved_by], backref='approved_adjustments')
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Badge(db.Model):
+    """Badges and awards model"""
+    __tablename__ = 'badges'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    badge_name = db.Column(db.String(100))
+    badge_description = db.Column(db.Text)
+    awarded_date = db.Column(db.Date)
+    awarded_by = db.Column(db.Integer, db.ForeignKey('users.id'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Certification(db.Model):
+    """Employee certifications"""
+    __tablename__ = 'certifications'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    certification_name = db.Column(db.String(255))
+    issuing_organization = db.Column(db.String(255))
+    issue_date = db.Column(db.Date)
+    expiration_date = db.Column(db.Date)
+    credential_id = db.Column(db.String(100))
+    credential_url = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Rows that appear on a user's profile page
+PROFILE_CHILD_MODELS = (SalaryAdjustment, Badge, Certification)
+
+@db.event.listens_for(OrmSession, 'before_flush')
+def bump_profile_versions(flush_session, flush_context, instances):
+    """Bump User.profile_version whenever a profile, or a row shown on it, changes.
+
+    The version feeds the profile page ETag. Covers ORM writes; bulk UPDATEs
+    of profile fields have to bump the column themselves.
+    """
+    owners = set()
+    for obj in list(flush_session.new) + list(flush_session.dirty) + list(flush_session.deleted):
+        if isinstance(obj, PROFILE_CHILD_MODELS):
+            owners.add(obj.user_id)
+        elif isinstance(obj, User) and obj in flush_session.dirty and flush_session.is_modified(obj):
+            obj.profile_version = (obj.profile_version or 1) + 1
+    if owners:
+        flush_session.execute(
+            db.update(User).where(User.id.in_(owners)).values(profile_version=User.profile_version + 1),
+            execution_options={'synchronize_session': False}
+        )
+
+class Report(db.Model):
+    """Reports storage"""
+    __tablename__ = 'reports'
+
+    id = db.Column(db.Integer, primary_key=True)
+    report_type = db.Column(db.String(50))  # Attendance, Payroll, Employee, Leave, Overtime, Performance
+    report_data = db.Column(db.JSON)
+    generated_date = db.Column(db.DateTime, default=datetime.utcnow)
+    generated_by = db.Column(db.Integer, db.ForeignKey('users.id'))
+
+class Holiday(db.Model):
+    """Company holidays (non-working days on top of the weekday rules)"""
+    __tablename__ = 'holidays'
+
+    id = db.Column(db.Integer, primary_key=True)
+    holiday_date = db.Column(db.Date, unique=True, nullable=False)
+    name = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class LeavePolicy(db.Model):
+    """Leave type and its entitlement rules"""
+    __tablename__ = 'leave_policies'
+
+    id = db.Column(db.Integer, primary_key=True)
+    leave_type = db.Column(db.String(50), unique=True, nullable=False)
+    annual_entitlement = db.Column(db.Integer, nullable=False)   # Days per year
+    accrual_rate = db.Column(db.Float)                           # Days per month; NULL = granted up front
+    carry_forward_cap = db.Column(db.Integer, default=0)         # Unused days kept at year end
+    employment_types = db.Column(db.JSON)                        # e.g. ["Full-time"]; NULL = everyone
+    contract_types = db.Column(db.JSON)                          # e.g. ["Permanent"]; NULL = everyone
+    is_active = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class LeaveAccrual(db.Model):
+    """Ledger of monthly accrual credits; one row per employee, leave type and month"""
+    __tablename__ = 'leave_accruals'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    leave_type = db.Column(db.String(50), nullable=False)
+    period = db.Column(db.Date, nullable=False)              # First day of the accrued month
+    days = db.Column(db.Numeric(7, 3), nullable=False)       # Exact (pro-rated) days earned
+    credited = db.Column(db.Integer, nullable=False)         # Whole days added to the balance
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (db.UniqueConstraint('leave_type', 'period', 'user_id', name='uq_accrual_type_period_user'),)
+
+class SchemaMigration(db.Model):
+    """Versions from MIGRATIONS that have been applied to this database"""
+    __tablename__ = 'schema_migrations'
+
+    version = db.Column(db.Integer, primary_key=True)
+    description = db.Column(db.String(200), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -0,0 +1,280 @@
+# WorkZen HRMS - request metrics and the slow-query log
+
+from flask import current_app, g, has_request_context, request
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+import bisect
+import json
+import logging
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+
+from .config import settings
+from .database import db
+
+class Histogram:
+    """Prometheus-style histogram: per-bucket counts plus count and sum"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip([*self.buckets, '+Inf'], self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+        yield f'{name}_sum{{{labels}}} {self.sum}'
+
+class RequestMetrics:
+    """Per-endpoint latency, SQL and response size histograms for /metrics.
+
+    Kept per process: under `flask serve` each worker reports its own numbers,
+    so scrape every worker (or run one worker per container) for totals.
+    """
+
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+    SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations = {}     # (endpoint, method, status) -> Histogram
+        self._endpoints = {}     # endpoint -> (statements, sql seconds, response bytes) histograms
+        self._n_plus_one = {}    # endpoint -> requests flagged
+
+    def record(self, endpoint, method, status, seconds, statements, sql_seconds, size, n_plus_one=False):
+        with self._lock:
+            key = (endpoint, method, status)
+            if key not in self._durations:
+                self._durations[key] = Histogram(self.LATENCY_BUCKETS)
+            self._durations[key].observe(seconds)
+            if endpoint not in self._endpoints:
+                self._endpoints[endpoint] = (
+                    Histogram(self.STATEMENT_BUCKETS), Histogram(self.LATENCY_BUCKETS), Histogram(self.SIZE_BUCKETS)
+                )
+            statement_hist, sql_hist, size_hist = self._endpoints[endpoint]
+            statement_hist.observe(statements)
+            sql_hist.observe(sql_seconds)
+            if size is not None:
+                size_hist.observe(size)
+            if n_plus_one:
+                self._n_plus_one[endpoint] = self._n_plus_one.get(endpoint, 0) + 1
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            lines += ['# HELP workzen_request_duration_seconds Request latency by endpoint',
+                      '# TYPE workzen_request_duration_seconds histogram']
+            for (endpoint, method, status), histogram in sorted(self._durations.items()):
+                lines += histogram.lines('workzen_request_duration_seconds',
+                                         f'endpoint="{endpoint}",method="{method}",status="{status}"')
+            for index, (name, help_text) in enumerate([
+                ('workzen_request_sql_statements', 'SQL statements run per request'),
+                ('workzen_request_sql_seconds', 'Time spent in SQL per request'),
+                ('workzen_response_size_bytes', 'Response body size'),
+            ]):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+                for endpoint, histograms in sorted(self._endpoints.items()):
+                    lines += histograms[index].lines(name, f'endpoint="{endpoint}"')
+            lines += ['# HELP workzen_n_plus_one_requests_total Requests that repeated one SQL statement '
+                      'more than N_PLUS_ONE_THRESHOLD times',
+                      '# TYPE workzen_n_plus_one_requests_total counter']
+            lines += [f'workzen_n_plus_one_requests_total{{endpoint="{endpoint}"}} {count}'
+                      for endpoint, count in sorted(self._n_plus_one.items())]
+        return lines
+
+request_metrics = RequestMetrics()
+
+def count_statement_start(conn, cursor, statement, parameters, context, executemany):
+    context.statement_started = time.perf_counter()
+
+def count_statement_end(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.statement_started
+    if has_request_context() and 'sql_statements' in g:
+        g.sql_statements += 1
+        g.sql_seconds += elapsed
+        # The statement text (placeholders, not values) is its shape
+        g.sql_shapes[statement] = g.sql_shapes.get(statement, 0) + 1
+
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    g.sql_statements = 0
+    g.sql_seconds = 0.0
+    g.sql_shapes = {}
+
+def record_request_metrics(response):
+    """Record latency, SQL counts and size, and log likely N+1 query patterns"""
+    if 'request_started' not in g:
+        return response
+    endpoint = request.endpoint or 'unmatched'
+    threshold = current_app.config['N_PLUS_ONE_THRESHOLD']
+    repeated = {
+        statement: count for statement, count in g.sql_shapes.items() if threshold and count > threshold
+    }
+    for statement, count in repeated.items():
+        current_app.logger.warning('Possible N+1 in %s: statement ran %d times: %s',
+                           endpoint, count, ' '.join(statement.split())[:300])
+    request_metrics.record(
+        endpoint, request.method, response.status_code, time.perf_counter() - g.request_started,
+        g.sql_statements, g.sql_seconds, response.content_length, n_plus_one=bool(repeated)
+    )
+    return response
+
+def parameter_shapes(parameters, executemany):
+    """Types of the bound parameters, never their values (they can hold personal data)"""
+    if executemany:
+        return {'rows': len(parameters), 'first': parameter_shapes(parameters[0], False) if parameters else None}
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    return [type(value).__name__ for value in parameters or ()]
+
+# Upper bound on per-process slow-query files read for the diagnostics page (newest first)
+MAX_SLOW_QUERY_FILES = 50
+
+class SlowQueryLog:
+    """Statements slower than SLOW_QUERY_MS, as JSON lines in rotating files.
+
+    Each process writes its own file, SLOW_QUERY_LOG suffixed with its pid:
+    RotatingFileHandler renames the file it rotates, which is only safe when
+    no other process has it open. recent() merges the files.
+
+    Each record carries the SQL, parameter types, bind, duration and the
+    request that ran it. Sampled SELECTs are queued for a background thread
+    that runs EXPLAIN (ANALYZE, BUFFERS) with the original parameters on the
+    reporting pool (read-only, statement timeout), so the request does not
+    wait and the primary does not run the query twice. The plan is written
+    later as a second record with the same id.
+    """
+
+    def __init__(self, path, max_bytes, backups, explain_sample):
+        self.path = path
+        self.explain_sample = explain_sample
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._logger = logging.getLogger('workzen.slow_queries')
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._lock = threading.Lock()
+        self._explain_queue = queue.Queue(maxsize=20)
+        self._explainer_pid = None
+        self._writer_pid = None
+
+    def _write(self, record):
+        with self._lock:
+            # A forked worker drops the handler it inherited and opens its own file
+            if self._writer_pid != os.getpid():
+                for handler in list(self._logger.handlers):
+                    self._logger.removeHandler(handler)
+                    handler.close()
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._logger.addHandler(RotatingFileHandler(
+                    f'{self.path}.{os.getpid()}', maxBytes=self._max_bytes, backupCount=self._backups, delay=True
+                ))
+                self._writer_pid = os.getpid()
+        self._logger.info(json.dumps(record, default=str))
+
+    def record(self, bind, statement, parameters, executemany, seconds, explain_engine=None):
+        record = {
+            'id': secrets.token_hex(6),
+            'at': datetime.utcnow().isoformat(timespec='seconds'),
+            'duration_ms': round(seconds * 1000, 1),
+            'bind': bind,
+            'statement': ' '.join(statement.split()),
+            'parameters': parameter_shapes(parameters, executemany),
+            'endpoint': request.endpoint if has_request_context() else None,
+            'method': request.method if has_request_context() else None,
+            'path': request.path if has_request_context() else None,
+        }
+        self._write(record)
+        if (explain_engine is not None and not executemany and self.explain_sample
+                and random.random() < self.explain_sample
+                and statement.lstrip()[:6].upper() in ('SELECT', 'WITH')):
+            self._start_explainer()
+            try:
+                self._explain_queue.put_nowait((record['id'], explain_engine, statement, parameters))
+            except queue.Full:
+                pass  # Sampling is best effort; never slow the request down
+
+    def _start_explainer(self):
+        # Threads do not survive fork, so each worker process starts its own
+        with self._lock:
+            if self._explainer_pid != os.getpid():
+                self._explainer_pid = os.getpid()
+                threading.Thread(target=self._explain_forever, name='slow-query-explain', daemon=True).start()
+
+    def _explain_forever(self):
+        while True:
+            record_id, engine, statement, parameters = self._explain_queue.get()
+            try:
+                with engine.connect() as connection:
+                    rows = connection.execution_options(slow_query_log=False).exec_driver_sql(
+                        f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+                    )
+                    self._write({'id': record_id, 'plan': [row[0] for row in rows]})
+            except Exception as e:
+                self._write({'id': record_id, 'plan_error': str(e)})
+
+    def _process_files(self):
+        """Current (unrotated) file of every process, most recently written first"""
+        directory, prefix = os.path.split(self.path)
+        if not os.path.isdir(directory):
+            return []
+        files = []
+        for name in os.listdir(directory):
+            suffix = name[len(prefix) + 1:]
+            if name.startswith(prefix + '.') and suffix.isdigit():
+                try:
+                    files.append((os.path.getmtime(os.path.join(directory, name)), os.path.join(directory, name)))
+                except OSError:
+                    continue  # Rotated away since listdir
+        return [path for _, path in sorted(files, reverse=True)[:MAX_SLOW_QUERY_FILES]]
+
+    def recent(self, limit=200):
+        """Newest slow statements across the workers' current files, with their plans attached"""
+        statements = []
+        for path in self._process_files():
+            entries = {}
+            try:
+                with open(path, encoding='utf-8') as f:
+                    lines = deque(f, maxlen=limit * 2)
+            except OSError:
+                continue
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if 'statement' in record:
+                    entries[record['id']] = record
+                elif record.get('id') in entries:
+                    entries[record['id']].update(record)
+            statements += reversed(list(entries.values()))
+        return sorted(statements, key=lambda record: record['at'], reverse=True)[:limit]
+
+slow_query_log = SlowQueryLog(
+    settings['SLOW_QUERY_LOG'], settings['SLOW_QUERY_LOG_BYTES'],
+    settings['SLOW_QUERY_LOG_BACKUPS'], settings['SLOW_QUERY_EXPLAIN_SAMPLE']
+)
+
+def log_slow_statements(engine, bind, threshold_ms, explain_engine):
+    """Record statements on engine slower than threshold_ms; sampled plans run on explain_engine"""
+    @db.event.listens_for(engine, 'after_cursor_execute')
+    def log_if_slow(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context.statement_started
+        if seconds * 1000 >= threshold_ms and context.execution_options.get('slow_query_log', True):
+            slow_query_log.record(bind, statement, parameters, executemany, seconds, explain_engine)
@@ -0,0 +1,217 @@
+# WorkZen HRMS - seed data, schema migrations and database setup
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from collections import namedtuple
+
+from .database import db
+from .models import Department, LeavePolicy, SchemaMigration, UserHierarchy
+from .caches import departments
+from .hierarchy import rebuild_user_hierarchy
+
+# Seeded into departments on first run; add more through /api/departments
+DEFAULT_DEPARTMENTS = ['Engineering', 'HR', 'Finance', 'Sales', 'Marketing', 'Operations', 'Administration']
+
+# Seeded into leave_policies on first run; edit the table afterwards.
+# Annual leave accrues monthly (20 days / 12, capped at the entitlement) so mid-year joiners earn it pro rata.
+DEFAULT_LEAVE_POLICIES = [
+    {'leave_type': 'Annual', 'annual_entitlement': 20, 'accrual_rate': 1.667, 'carry_forward_cap': 10},
+    {'leave_type': 'Sick', 'annual_entitlement': 10, 'accrual_rate': None, 'carry_forward_cap': 0},
+    {'leave_type': 'Casual', 'annual_entitlement': 5, 'accrual_rate': None, 'carry_forward_cap': 0},
+    {'leave_type': 'Maternity', 'annual_entitlement': 90, 'accrual_rate': None, 'carry_forward_cap': 0},
+    {'leave_type': 'Unpaid', 'annual_entitlement': 10, 'accrual_rate': None, 'carry_forward_cap': 0}
+]
+
+# Versioned schema changes on top of db.create_all(). Append new versions; never edit
+# one that has shipped. Statements are idempotent so databases upgraded before
+# versioning (or created fresh by create_all) can apply every version safely.
+Migration = namedtuple('Migration', ['version', 'description', 'statements'])
+
+# Indexes for the hot query patterns; explain-hot-queries --compare drops and
+# recreates exactly these
+PERFORMANCE_INDEXES = {
+    # Own leaves on the time off page, newest first
+    'ix_leaves_user_created': 'leaves (user_id, created_at DESC)',
+    # All leave requests filtered by status, newest first
+    'ix_leaves_status_created': 'leaves (status, created_at DESC)',
+    # Pending approval queues (HR sees all, approvers their own) and the pending count
+    'ix_leaves_pending_created': "leaves (created_at DESC) WHERE status = 'Pending'",
+    'ix_leaves_pending_approver': "leaves (approved_by, created_at DESC) WHERE status = 'Pending'",
+    # Monthly payroll statistics and the payslip list filtered by month and status
+    'ix_payslips_month_status': 'payslips (payroll_month, status)',
+    # Daily attendance counts and date-range reports
+    'ix_attendance_date_status': 'attendance (attendance_date, status)',
+    # Salary history on the payroll and profile pages
+    'ix_salary_adjustments_user_date': 'salary_adjustments (user_id, adjustment_date DESC)',
+    # Profile page badges and certifications
+    'ix_badges_user_id': 'badges (user_id)',
+    'ix_certifications_user_id': 'certifications (user_id)',
+}
+
+MIGRATIONS = [
+    Migration(1, 'Leave row versions and carried-forward balances', [
+        "ALTER TABLE leaves ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1",
+        "ALTER TABLE leave_balance ADD COLUMN IF NOT EXISTS carried_forward INTEGER DEFAULT 0",
+    ]),
+    Migration(2, 'No overlapping active leaves', [
+        # One active (Pending/Approved) leave per user per day; the GiST index also serves date-range lookups
+        "CREATE EXTENSION IF NOT EXISTS btree_gist",
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'ex_leaves_user_active_overlap') THEN
+                ALTER TABLE leaves ADD CONSTRAINT ex_leaves_user_active_overlap
+                    EXCLUDE USING gist (user_id WITH =, daterange(start_date, end_date, '[]') WITH &&)
+                    WHERE (status IN ('Pending', 'Approved'));
+            END IF;
+        END $$
+        """,
+    ]),
+    Migration(3, 'Employee search indexes', [
+        # Trigram index over the employee_search_document() expression,
+        # plus a prefix index for terms shorter than a trigram
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        """
+        CREATE INDEX IF NOT EXISTS ix_users_search_trgm ON users USING gin (lower(
+            coalesce(full_name, '') || ' ' || coalesce(login_id, '') || ' ' || coalesce(email, '') || ' ' ||
+            coalesce(department, '') || ' ' || coalesce(job_title, '')
+        ) gin_trgm_ops)
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_users_full_name_prefix ON users (lower(full_name) text_pattern_ops)",
+    ]),
+    Migration(4, 'Departments table', [
+        # Move the free-text users.department values into the departments table
+        "ALTER TABLE users ADD COLUMN IF NOT EXISTS department_id INTEGER REFERENCES departments (id)",
+        "CREATE INDEX IF NOT EXISTS ix_users_department_id ON users (department_id)",
+        """
+        INSERT INTO departments (name, created_at)
+        SELECT DISTINCT btrim(department), now() FROM users WHERE btrim(department) <> ''
+        ON CONFLICT (name) DO NOTHING
+        """,
+        """
+        UPDATE users SET department_id = departments.id, department = departments.name
+        FROM departments
+        WHERE users.department_id IS NULL AND btrim(users.department) = departments.name
+        """,
+    ]),
+    Migration(5, 'Profile versions for ETags', [
+        "ALTER TABLE users ADD COLUMN IF NOT EXISTS profile_version INTEGER NOT NULL DEFAULT 1",
+    ]),
+    Migration(6, 'Indexes for hot queries', [
+        f"CREATE INDEX IF NOT EXISTS {name} ON {definition}" for name, definition in PERFORMANCE_INDEXES.items()
+    ]),
+    Migration(7, 'Native enums for roles and statuses', [
+        # Fails (and rolls back) if a row holds a value outside the enum; fix those rows first.
+        # Each table is rewritten and its indexes rebuilt under an exclusive lock.
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'user_role') THEN
+                CREATE TYPE user_role AS ENUM ('ADMIN', 'HR_OFFICER', 'PAYROLL_OFFICER', 'EMPLOYEE');
+            END IF;
+            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'attendance_status') THEN
+                CREATE TYPE attendance_status AS ENUM ('Present', 'Absent', 'Late');
+            END IF;
+            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'leave_status') THEN
+                CREATE TYPE leave_status AS ENUM ('Pending', 'Approved', 'Rejected');
+            END IF;
+            IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'payslip_status') THEN
+                CREATE TYPE payslip_status AS ENUM ('Draft', 'Processed', 'Paid');
+            END IF;
+        END $$
+        """,
+        """
+        DO $$
+        BEGIN
+            IF (SELECT data_type FROM information_schema.columns
+                WHERE table_name = 'users' AND column_name = 'role') <> 'USER-DEFINED' THEN
+                ALTER TABLE users ALTER COLUMN role TYPE user_role USING role::user_role;
+            END IF;
+            IF (SELECT data_type FROM information_schema.columns
+                WHERE table_name = 'attendance' AND column_name = 'status') <> 'USER-DEFINED' THEN
+                ALTER TABLE attendance ALTER COLUMN status TYPE attendance_status USING status::attendance_status;
+            END IF;
+            IF (SELECT data_type FROM information_schema.columns
+                WHERE table_name = 'payslips' AND column_name = 'status') <> 'USER-DEFINED' THEN
+                ALTER TABLE payslips ALTER COLUMN status TYPE payslip_status USING status::payslip_status;
+            END IF;
+        END $$
+        """,
+        # Partial indexes and the exclusion constraint on leaves.status are recreated so
+        # their predicates compare enums (a rewritten VARCHAR predicate would cast to text
+        # and no longer match the queries)
+        """
+        DO $$
+        BEGIN
+            IF (SELECT data_type FROM information_schema.columns
+                WHERE table_name = 'leaves' AND column_name = 'status') <> 'USER-DEFINED' THEN
+                ALTER TABLE leaves DROP CONSTRAINT IF EXISTS ex_leaves_user_active_overlap;
+                DROP INDEX IF EXISTS ix_leaves_pending_created;
+                DROP INDEX IF EXISTS ix_leaves_pending_approver;
+                ALTER TABLE leaves ALTER COLUMN status TYPE leave_status USING status::leave_status;
+                ALTER TABLE leaves ADD CONSTRAINT ex_leaves_user_active_overlap
+                    EXCLUDE USING gist (user_id WITH =, daterange(start_date, end_date, '[]') WITH &&)
+                    WHERE (status IN ('Pending', 'Approved'));
+                CREATE INDEX ix_leaves_pending_created ON leaves (created_at DESC) WHERE status = 'Pending';
+                CREATE INDEX ix_leaves_pending_approver ON leaves (approved_by, created_at DESC)
+                    WHERE status = 'Pending';
+            END IF;
+        END $$
+        """,
+    ]),
+    Migration(8, 'Reserve pending leave days in balances', [
+        # apply_leave now takes the days out of remaining_days when a leave is filed, so
+        # leaves still Pending from before must hold theirs too. Recomputed from the
+        # balance itself, so running it again gives the same result.
+        """
+        UPDATE leave_balance AS b
+        SET remaining_days = b.total_days - COALESCE(b.used_days, 0) - COALESCE((
+            SELECT SUM(l.number_of_days) FROM leaves AS l
+            WHERE l.user_id = b.user_id AND l.leave_type = b.leave_type
+              AND l.status = 'Pending' AND EXTRACT(YEAR FROM l.start_date) = b.year
+        ), 0)
+        """,
+    ]),
+]
+
+# pg_advisory_xact_lock key so workers starting together apply each migration once
+MIGRATION_LOCK_ID = 4404
+
+def migrate_schema():
+    """Apply pending MIGRATIONS in order, each in its own transaction. Returns the applied versions."""
+    applied = set(db.session.scalars(db.select(SchemaMigration.version)))
+    db.session.commit()
+    newly_applied = []
+    for migration in MIGRATIONS:
+        if migration.version in applied:
+            continue
+        db.session.execute(db.select(db.func.pg_advisory_xact_lock(MIGRATION_LOCK_ID)))
+        # Another worker may have applied it while we waited for the lock
+        if db.session.get(SchemaMigration, migration.version) is None:
+            for statement in migration.statements:
+                db.session.execute(db.text(statement))
+            db.session.add(SchemaMigration(version=migration.version, description=migration.description))
+            newly_applied.append(migration.version)
+        db.session.commit()
+    return newly_applied
+
+def init_db():
+    """Create all database tables and seed data (run inside an app context)"""
+    db.create_all(bind_key=None)
+    for version in migrate_schema():
+        print(f"✅ Applied migration {version}")
+    db.session.execute(
+        pg_insert(LeavePolicy).values(DEFAULT_LEAVE_POLICIES).on_conflict_do_nothing(
+            index_elements=['leave_type']
+        )
+    )
+    db.session.execute(
+        pg_insert(Department).values([{'name': name} for name in DEFAULT_DEPARTMENTS])
+        .on_conflict_do_nothing(index_elements=['name'])
+    )
+    db.session.commit()
+    departments.invalidate()
+    # First run after the closure table was added: build it from users.manager_id
+    if not db.session.query(UserHierarchy.query.exists()).scalar():
+        rebuild_user_hierarchy()
+        db.session.commit()
+    print("✅ Database tables created successfully")
@@ -0,0 +1,43 @@
+# WorkZen HRMS - employee search expressions
+
+from .database import db
+from .models import User
+
+# Keep in sync with the ix_users_search_trgm expression in MIGRATIONS
+EMPLOYEE_SEARCH_FIELDS = ('full_name', 'login_id', 'email', 'department', 'job_title')
+
+def employee_search_document():
+    """Lower-cased name, login ID, email, department and job title, as indexed"""
+    document = None
+    for field in EMPLOYEE_SEARCH_FIELDS:
+        part = db.func.coalesce(getattr(User, field), db.literal_column("''"))
+        document = part if document is None else document + db.literal_column("' '") + part
+    return db.func.lower(document)
+
+def escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def employee_search_clause(term):
+    """Filter users matching a search term.
+
+    Terms of three or more characters match anywhere in the search document
+    through the trigram index; shorter ones (too short for trigrams) are a
+    name-prefix match on the lower(full_name) index.
+    """
+    term = escape_like(term.strip().lower())
+    if len(term) < 3:
+        return db.func.lower(User.full_name).like(f'{term}%')
+    return employee_search_document().like(f'%{term}%')
+
+def employee_search_rank(term):
+    """Sort key for autocomplete: exact login ID, then name prefix, word prefix, other fields"""
+    term = escape_like(term.strip().lower())
+    full_name = db.func.lower(User.full_name)
+    return db.case(
+        (db.func.lower(User.login_id) == term, 0),
+        (full_name.like(f'{term}%'), 1),
+        (full_name.like(f'% {term}%'), 2),
+        (db.func.lower(User.login_id).like(f'{term}%'), 3),
+        (db.func.lower(User.email).like(f'{term}%'), 4),
+        else_=5
+    )
@@ -0,0 +1,38 @@
+# WorkZen HRMS - production server helpers
+
+from sqlalchemy.exc import OperationalError
+from datetime import datetime
+
+from .database import db
+from .caches import approver_pool, company_calendar, departments, leave_policies
+
+def warm_up(app):
+    """Prime the in-process caches and compile every template.
+
+    `flask serve` runs this in the gunicorn master before forking, so workers
+    share the result copy-on-write. The connections it used are closed
+    afterwards: a socket inherited across fork must not be used by two processes.
+    """
+    with app.app_context():
+        leave_policies.policies()
+        departments.all()
+        approver_pool.preload()
+        today = datetime.now().date()
+        company_calendar.working_days(today, today)
+        for name in app.jinja_env.list_templates():
+            app.jinja_env.get_template(name)
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+def open_pool_connections(app):
+    """Fill each worker's pools up to pool_size so early requests do not wait on connects"""
+    with app.app_context():
+        for bind_key, engine in db.engines.items():
+            try:
+                connections = [engine.connect() for _ in range(engine.pool.size())]
+            except OperationalError as e:
+                app.logger.warning('Could not pre-open %s connections: %s', bind_key or 'primary', e)
+                continue
+            for connection in connections:
+                connection.close()
@@ -0,0 +1,175 @@
+# WorkZen HRMS - leave balance and payroll calculations
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import timedelta
+
+from .database import db
+from .models import LeaveAccrual, LeaveBalance, User
+from .caches import leave_policies
+
+BALANCE_INSERT_COLUMNS = ['user_id', 'leave_type', 'total_days', 'used_days', 'remaining_days',
+                          'carried_forward', 'year', 'created_at']
+
+def initialize_leave_balances(year):
+    """Create missing balances for all active employees in one INSERT ... SELECT"""
+    if not leave_policies.policies():
+        return 0
+    policies = leave_policies.relation()
+
+    result = db.session.execute(
+        pg_insert(LeaveBalance).from_select(
+            BALANCE_INSERT_COLUMNS,
+            db.select(
+                User.id, policies.c.leave_type, policies.c.opening_days, db.literal(0),
+                policies.c.opening_days, db.literal(0), db.literal(year), db.func.now()
+            ).join(policies, leave_policies.eligible_clause(policies)).where(
+                User.role == 'EMPLOYEE',
+                User.is_active.is_(True)
+            )
+        ).on_conflict_do_nothing(index_elements=['user_id', 'leave_type', 'year'])
+    )
+    return result.rowcount
+
+def rollover_leave_balances(year):
+    """Open `year` balances, carrying forward unused days from the previous year.
+
+    One INSERT ... SELECT per leave type covers eligible active employees and
+    anyone holding a balance of that type last year. Rows that already exist
+    (e.g. opened early by a future-dated leave) get their carry-forward
+    replaced rather than added again, so the job can safely be re-run.
+    Returns the number of balances written per leave type.
+    """
+    written = {}
+    for policy in leave_policies.policies().values():
+        previous = db.aliased(LeaveBalance)
+        carried = db.func.least(
+            db.func.greatest(db.func.coalesce(previous.remaining_days, 0), 0),
+            policy.carry_forward_cap
+        )
+        rows = db.select(
+            User.id, db.literal(policy.leave_type), policy.opening_days + carried, db.literal(0),
+            policy.opening_days + carried, carried, db.literal(year), db.func.now()
+        ).select_from(User).outerjoin(previous, db.and_(
+            previous.user_id == User.id,
+            previous.leave_type == policy.leave_type,
+            previous.year == year - 1
+        )).where(
+            User.is_active.is_(True),
+            db.or_(
+                db.and_(User.role == 'EMPLOYEE', leave_policies.user_clause(policy)),
+                previous.id.isnot(None)
+            )
+        )
+
+        insert = pg_insert(LeaveBalance).from_select(BALANCE_INSERT_COLUMNS, rows)
+        previous_carry = db.func.coalesce(LeaveBalance.carried_forward, 0)
+        result = db.session.execute(insert.on_conflict_do_update(
+            index_elements=['user_id', 'leave_type', 'year'],
+            set_={
+                'total_days': LeaveBalance.total_days - previous_carry + insert.excluded.carried_forward,
+                'remaining_days': LeaveBalance.remaining_days - previous_carry + insert.excluded.carried_forward,
+                'carried_forward': insert.excluded.carried_forward
+            }
+        ))
+        written[policy.leave_type] = result.rowcount
+    return written
+
+def accrue_leave(period):
+    """Credit one month of accrual for every accruing leave type.
+
+    Each policy takes a single statement: employees who had joined by the end
+    of the month earn accrual_rate days, pro-rated by calendar days in their
+    joining month and capped at the annual entitlement. The ledger insert is
+    ON CONFLICT DO NOTHING on (leave_type, period, user_id), and only rows it
+    actually wrote are credited to LeaveBalance, so re-running a month is a
+    no-op. Balances hold whole days, so each credit is the change in the
+    floor of the year's running total.
+    Returns the number of employees credited per leave type.
+    """
+    month_start = period.replace(day=1)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    year_start = month_start.replace(month=1)
+
+    credited = {}
+    for policy in leave_policies.policies().values():
+        if not policy.accrual_rate:
+            continue
+
+        prior = db.select(
+            LeaveAccrual.user_id, db.func.sum(LeaveAccrual.days).label('accrued')
+        ).where(
+            LeaveAccrual.leave_type == policy.leave_type,
+            LeaveAccrual.period >= year_start,
+            LeaveAccrual.period < month_start
+        ).group_by(LeaveAccrual.user_id).cte('prior')
+
+        accrued = db.func.coalesce(prior.c.accrued, 0)
+        served = db.case(
+            (User.date_of_joining > month_start,
+             (month_end.day - db.extract('day', User.date_of_joining) + 1) / month_end.day),
+            else_=1
+        )
+        earned = db.func.least(
+            db.func.round(db.cast(policy.accrual_rate * served, db.Numeric), 3),
+            policy.annual_entitlement - accrued
+        )
+        candidates = db.select(
+            User.id.label('user_id'), earned.label('days'), accrued.label('accrued')
+        ).outerjoin(prior, prior.c.user_id == User.id).where(
+            User.role == 'EMPLOYEE',
+            User.is_active.is_(True),
+            leave_policies.user_clause(policy),
+            db.or_(User.date_of_joining.is_(None), User.date_of_joining <= month_end)
+        ).cte('candidates')
+
+        ledger = pg_insert(LeaveAccrual).from_select(
+            ['user_id', 'leave_type', 'period', 'days', 'credited', 'created_at'],
+            db.select(
+                candidates.c.user_id, db.literal(policy.leave_type), db.literal(month_start),
+                candidates.c.days,
+                db.cast(db.func.floor(candidates.c.accrued + candidates.c.days) -
+                        db.func.floor(candidates.c.accrued), db.Integer),
+                db.func.now()
+            ).where(candidates.c.days > 0)
+        ).on_conflict_do_nothing(
+            index_elements=['leave_type', 'period', 'user_id']
+        ).returning(LeaveAccrual.user_id, LeaveAccrual.credited).cte('ledger')
+
+        insert = pg_insert(LeaveBalance).from_select(
+            BALANCE_INSERT_COLUMNS,
+            db.select(
+                ledger.c.user_id, db.literal(policy.leave_type), ledger.c.credited, db.literal(0),
+                ledger.c.credited, db.literal(0), db.literal(month_start.year), db.func.now()
+            )
+        )
+        result = db.session.execute(insert.on_conflict_do_update(
+            index_elements=['user_id', 'leave_type', 'year'],
+            set_={
+                'total_days': LeaveBalance.total_days + insert.excluded.total_days,
+                'remaining_days': LeaveBalance.remaining_days + insert.excluded.remaining_days
+            }
+        ))
+        credited[policy.leave_type] = result.rowcount
+    return credited
+
+def payslip_amounts(basic):
+    """Earnings and deductions for a month's basic salary"""
+    hra = basic * 0.20  # 20% HRA
+    da = basic * 0.05   # 5% DA
+    gross = basic + hra + da
+
+    # Deductions
+    pf = basic * 0.12           # 12% PF
+    income_tax = basic * 0.05   # 5% Income Tax
+    prof_tax = 200              # Fixed Professional Tax
+
+    return {
+        'basic_salary': basic,
+        'hra': hra,
+        'da': da,
+        'gross_earnings': gross,
+        'pf': pf,
+        'income_tax': income_tax,
+        'professional_tax': prof_tax,
+        'net_salary': gross - pf - income_tax - prof_tax
+    }
@@ -0,0 +1,276 @@
+# WorkZen HRMS - synthetic data for staging and benchmarks
+
+from werkzeug.security import generate_password_hash
+from datetime import date, datetime, timedelta
+from io import StringIO
+import csv
+import itertools
+import math
+import random
+
+from .database import db
+from .models import AttendanceStatus, LeaveStatus, PayslipStatus, Role
+from .caches import approver_pool, availability_cache, company_calendar, departments, leave_policies
+from .hierarchy import rebuild_user_hierarchy
+from .services import BALANCE_INSERT_COLUMNS, payslip_amounts
+from .schema import PERFORMANCE_INDEXES
+
+SYNTHETIC_FIRST_NAMES = ['Aarav', 'Diya', 'Kabir', 'Meera', 'Rohan', 'Ananya', 'Vikram', 'Isha', 'Arjun', 'Priya',
+                         'Sameer', 'Neha', 'Karan', 'Pooja', 'Rahul', 'Sneha', 'Aditya', 'Kavya', 'Nikhil', 'Tara']
+
+SYNTHETIC_LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Reddy', 'Nair', 'Gupta', 'Mehta', 'Rao', 'Singh', 'Das',
+                        'Kulkarni', 'Joshi', 'Menon', 'Bose', 'Chopra', 'Verma', 'Pillai', 'Shah', 'Kapoor', 'Sen']
+
+# Relative frequency of generated leave types (types without an active policy are skipped)
+SYNTHETIC_LEAVE_MIX = {'Annual': 6, 'Sick': 3, 'Casual': 1}
+
+# Direct reports per manager in the generated org chart
+SYNTHETIC_TEAM_SIZE = 6
+
+def copy_rows(cursor, table, columns, rows, batch_size=100_000):
+    """Load rows with COPY ... FROM STDIN (CSV) in batches; None becomes NULL. Returns the row count."""
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    rows = iter(rows)
+    count = 0
+    while batch := list(itertools.islice(rows, batch_size)):
+        buffer = StringIO()
+        csv.writer(buffer).writerows(batch)
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+        count += len(batch)
+    return count
+
+def month_starts(first, last):
+    """First day of each month from first's month to last's month, inclusive"""
+    current = first.replace(day=1)
+    while current <= last:
+        yield current
+        current = (current + timedelta(days=32)).replace(day=1)
+
+def synthetic_accruals(policy, joined, year, end_date):
+    """(period, days, credited) ledger rows accrue_leave would have written for a year up to end_date"""
+    rows = []
+    accrued = 0
+    for month_start in month_starts(date(year, 1, 1), min(date(year, 12, 31), end_date)):
+        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        if joined > month_end:
+            continue
+        served = (month_end.day - joined.day + 1) / month_end.day if joined > month_start else 1
+        days = round(min(policy.accrual_rate * served, policy.annual_entitlement - accrued), 3)
+        if days > 0:
+            rows.append((month_start, days, math.floor(round(accrued + days, 3)) - math.floor(accrued)))
+            accrued = round(accrued + days, 3)
+    return rows
+
+def generate_dataset(user_count, years, seed, end_date, password):
+    """Load a synthetic organisation through COPY; the same seed and end_date give the same data.
+
+    Users get departments, a manager tree and salary histories; each then gets
+    leaves (within the year's entitlement, never overlapping), attendance on
+    every other working day, yearly leave balances and monthly payslips.
+    Accruing leave types also get the ledger rows accrue_leave would have
+    written, so running it for a generated month credits nothing twice.
+    """
+    rng = random.Random(seed)
+    start_date = date(end_date.year - years + 1, 1, 1)
+    department_ids = [department.id for department in departments.all()]
+    policies = leave_policies.policies()
+    password_hash = generate_password_hash(password)
+    now = datetime.utcnow()
+    calendar_days = [start_date + timedelta(days=n) for n in range((end_date - start_date).days + 1)]
+    working_days = [day for day in calendar_days if day.weekday() in company_calendar.working_weekdays]
+    cursor = db.session.connection().connection.cursor()
+    counts = {}
+
+    cursor.execute(
+        "SELECT nextval(pg_get_serial_sequence('users', 'id')) FROM generate_series(1, %s)", (user_count,)
+    )
+    ids = [row[0] for row in cursor.fetchall()]
+    admin_id = ids[0]
+
+    # Users: the first is the admin at the top of the tree; each department is a tree of
+    # SYNTHETIC_TEAM_SIZE-wide teams under a head who reports to the admin
+    people = []
+    members_by_department = {}
+    for n, user_id in enumerate(ids):
+        role = (Role.ADMIN if n == 0 else Role.HR_OFFICER if n % 100 == 1
+                else Role.PAYROLL_OFFICER if n % 200 == 2 else Role.EMPLOYEE)
+        department_id = rng.choice(department_ids)
+        members = members_by_department.setdefault(department_id, [])
+        if n == 0:
+            manager_id = None
+        else:
+            manager_id = members[(len(members) - 1) // SYNTHETIC_TEAM_SIZE] if members else admin_id
+            members.append(user_id)
+        if rng.random() < 0.7:
+            joined = start_date - timedelta(days=rng.randint(1, 5 * 365))
+        else:
+            joined = start_date + timedelta(days=rng.randint(0, max((end_date - start_date).days - 30, 0)))
+
+        # Salary history: a raise on every work anniversary up to end_date
+        salary = float(rng.randrange(25_000, 150_000, 500))
+        salaries = [(joined, salary)]
+        anniversary = 1
+        while True:
+            try:
+                raised_on = joined.replace(year=joined.year + anniversary)
+            except ValueError:  # Joined on 29 February
+                raised_on = joined.replace(year=joined.year + anniversary, day=28)
+            if raised_on > end_date:
+                break
+            salary = round(salary * rng.uniform(1.03, 1.12), -2)
+            salaries.append((raised_on, salary))
+            anniversary += 1
+
+        people.append({
+            'id': user_id, 'n': n + 1, 'role': role, 'department_id': department_id, 'manager_id': manager_id,
+            'joined': joined, 'salaries': salaries,
+            'full_name': f"{rng.choice(SYNTHETIC_FIRST_NAMES)} {rng.choice(SYNTHETIC_LAST_NAMES)}",
+            'employment_type': 'Full-time' if rng.random() < 0.9 else 'Part-time',
+            'contract_type': 'Permanent' if rng.random() < 0.85 else 'Contract',
+            'date_of_birth': joined - timedelta(days=rng.randint(22 * 365, 50 * 365)),
+            'gender': rng.choice(['Male', 'Female']),
+        })
+
+    counts['users'] = copy_rows(cursor, 'users', [
+        'id', 'login_id', 'email', 'password', 'full_name', 'role', 'department', 'department_id', 'job_title',
+        'manager_id', 'employment_type', 'contract_type', 'date_of_joining', 'date_of_birth', 'gender',
+        'basic_salary', 'is_active', 'created_at', 'updated_at'
+    ], (
+        (p['id'], f"SYN{p['n']:06d}", f"syn{p['n']}@example.com", password_hash, p['full_name'], p['role'].value,
+         departments.name(p['department_id']), p['department_id'], p['role'].replace('_', ' ').title(),
+         p['manager_id'], p['employment_type'], p['contract_type'], p['joined'], p['date_of_birth'],
+         p['gender'], p['salaries'][-1][1], True, now, now)
+        for p in people
+    ))
+
+    counts['salary_adjustments'] = copy_rows(cursor, 'salary_adjustments', [
+        'user_id', 'adjustment_date', 'old_salary', 'new_salary', 'reason', 'approved_by', 'created_at'
+    ], (
+        (p['id'], raised_on, old, new, 'Annual review', p['manager_id'] or admin_id, now)
+        for p in people
+        for (_, old), (raised_on, new) in zip(p['salaries'], p['salaries'][1:])
+        if raised_on >= start_date
+    ))
+
+    # Leaves: a few per year, within each eligible type's entitlement; approved days get no attendance
+    leave_rows = []
+    balance_rows = []
+    accrual_rows = []
+    days_off = {}
+    for p in people:
+        eligible = {
+            leave_type: policies[leave_type] for leave_type in SYNTHETIC_LEAVE_MIX
+            if leave_type in policies and leave_policies.eligible(
+                policies[leave_type], p['employment_type'], p['contract_type'])
+        }
+        off = days_off.setdefault(p['id'], set())
+        for year in range(start_date.year, end_date.year + 1):
+            year_days = [day for day in working_days if day.year == year and day >= p['joined']]
+            used = dict.fromkeys(eligible, 0)
+            # Pending days are reserved out of remaining_days, as apply_leave does
+            pending = dict.fromkeys(eligible, 0)
+            entitled = {}
+            for leave_type, policy in eligible.items():
+                if policy.accrual_rate:
+                    accruals = synthetic_accruals(policy, p['joined'], year, end_date)
+                    accrual_rows.extend(
+                        (p['id'], leave_type, period, days, credited, now) for period, days, credited in accruals
+                    )
+                    entitled[leave_type] = sum(credited for _, _, credited in accruals)
+                else:
+                    entitled[leave_type] = policy.annual_entitlement
+            if eligible and year_days:
+                free_from = 0
+                for index in sorted(rng.sample(range(len(year_days)), min(rng.randint(2, 5), len(year_days)))):
+                    length = rng.randint(1, 5)
+                    leave_type = rng.choices(list(eligible), [SYNTHETIC_LEAVE_MIX[t] for t in eligible])[0]
+                    if index < free_from or used[leave_type] + pending[leave_type] + length > entitled[leave_type]:
+                        continue
+                    leave_days = year_days[index:index + length]
+                    free_from = index + length + 1
+                    start, end = leave_days[0], leave_days[-1]
+                    created = datetime.combine(start, datetime.min.time()) - timedelta(days=rng.randint(5, 30))
+                    if end >= end_date:
+                        status = LeaveStatus.PENDING
+                    else:
+                        status = LeaveStatus.APPROVED if rng.random() < 0.85 else LeaveStatus.REJECTED
+                    if status == LeaveStatus.APPROVED:
+                        used[leave_type] += len(leave_days)
+                        off.update(leave_days)
+                    elif status == LeaveStatus.PENDING:
+                        pending[leave_type] += len(leave_days)
+                    leave_rows.append((
+                        p['id'], leave_type, start, end, 'Synthetic leave', status.value, p['manager_id'],
+                        len(leave_days), 1, created,
+                        created + timedelta(days=rng.randint(1, 3)) if status != LeaveStatus.PENDING else created
+                    ))
+            if p['joined'] <= date(year, 12, 31):
+                for leave_type in eligible:
+                    balance_rows.append((p['id'], leave_type, entitled[leave_type], used[leave_type],
+                                         entitled[leave_type] - used[leave_type] - pending[leave_type], 0, year, now))
+
+    counts['leaves'] = copy_rows(cursor, 'leaves', [
+        'user_id', 'leave_type', 'start_date', 'end_date', 'reason', 'status', 'approved_by', 'number_of_days',
+        'version', 'created_at', 'updated_at'
+    ], leave_rows)
+    counts['leave_balance'] = copy_rows(cursor, 'leave_balance', BALANCE_INSERT_COLUMNS, balance_rows)
+    counts['leave_accruals'] = copy_rows(cursor, 'leave_accruals', [
+        'user_id', 'leave_type', 'period', 'days', 'credited', 'created_at'
+    ], accrual_rows)
+
+    # The bulk of the rows: built from pre-formatted strings and bare random() calls to keep COPY fed
+    clock = [f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(24 * 60)]
+    created = now.isoformat()
+    present, late, absent = AttendanceStatus.PRESENT.value, AttendanceStatus.LATE.value, AttendanceStatus.ABSENT.value
+
+    def attendance_rows():
+        random_ = rng.random
+        for p in people:
+            user_id, joined, off = p['id'], p['joined'], days_off[p['id']]
+            for day in working_days:
+                if day < joined or day in off:
+                    continue
+                roll = random_()
+                if roll < 0.03:
+                    yield (user_id, day, None, None, absent, 0, created)
+                    continue
+                check_in = 510 + (60 + int(random_() * 120) if roll < 0.09 else int(random_() * 60))  # From 08:30
+                worked = 450 + int(random_() * 120)
+                yield (user_id, day, clock[check_in], clock[check_in + worked],
+                       late if roll < 0.09 else present, round(worked / 60, 2), created)
+
+    # Checking the foreign key and building the secondary index once after the load
+    # is several times cheaper than doing both row by row
+    cursor.execute("ALTER TABLE attendance DROP CONSTRAINT IF EXISTS attendance_user_id_fkey")
+    cursor.execute("DROP INDEX IF EXISTS ix_attendance_date_status")
+    counts['attendance'] = copy_rows(cursor, 'attendance', [
+        'user_id', 'attendance_date', 'check_in', 'check_out', 'status', 'working_hours', 'created_at'
+    ], attendance_rows())
+    cursor.execute(
+        "ALTER TABLE attendance ADD CONSTRAINT attendance_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id)"
+    )
+    cursor.execute(f"CREATE INDEX ix_attendance_date_status ON {PERFORMANCE_INDEXES['ix_attendance_date_status']}")
+
+    def payslip_rows():
+        for p in people:
+            for month in month_starts(max(p['joined'], start_date), end_date.replace(day=1) - timedelta(days=1)):
+                basic = [salary for effective, salary in p['salaries'] if effective <= month][-1] \
+                    if p['joined'] <= month else p['salaries'][0][1]
+                amounts = payslip_amounts(basic)
+                processed = datetime.combine(
+                    (month + timedelta(days=32)).replace(day=1), datetime.min.time()
+                ) + timedelta(hours=10)
+                yield (p['id'], month, *amounts.values(), PayslipStatus.PROCESSED.value, processed, processed)
+
+    counts['payslips'] = copy_rows(cursor, 'payslips', [
+        'user_id', 'payroll_month', *payslip_amounts(0).keys(), 'status', 'processed_date', 'created_at'
+    ], payslip_rows())
+
+    counts['user_hierarchy'] = rebuild_user_hierarchy()
+    cursor.execute(
+        "ANALYZE users, salary_adjustments, leaves, leave_balance, leave_accruals, attendance, payslips, user_hierarchy"
+    )
+    approver_pool.invalidate()
+    availability_cache.invalidate()
+    return counts